@@ -6,11 +6,12 @@ Collects and analyzes responses for different scenarios
 """
 
 import asyncio
+import hashlib
 import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
 # Add the middleware app to path
@@ -38,47 +39,124 @@ ANALYZERS = [
     "Floss", "DetectItEasy", "ELF_Info"  # Added these three new analyzers
 ]
 
+# Existing IntelOwl jobs worth reusing; failed ones are rerun
+REUSABLE_STATUSES = ("running", "reported_without_fails")
+
+def _walk_keys(obj: Any):
+    """Yield every dict key in a nested response without stringifying it"""
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield from current.keys()
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+
 class AnalyzerTester:
     def __init__(self):
         self.service = IntelOwlService()
         self.samples_dir = Path("/home/anonymous/COLLEGE/ThreatFlow/testing_responses/Malware safe Malware samples")
         self.responses_dir = Path("/home/anonymous/COLLEGE/ThreatFlow/testing_responses/responses")
         self.responses_dir.mkdir(exist_ok=True)
+        # Content digests per sample and job ids per (analyzer, digest)
+        self._hashes: Dict[Path, str] = {}
+        self._job_cache: Dict[Tuple[str, str], int] = {}
+        # Per-test records are streamed to disk by a background writer task
+        self._write_q: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    def _md5(self, file_path: Path) -> str:
+        """Hash a sample once; IntelOwl's availability lookup is keyed by MD5"""
+        digest = self._hashes.get(file_path)
+        if digest is None:
+            digest = hashlib.md5(file_path.read_bytes()).hexdigest()
+            self._hashes[file_path] = digest
+        return digest
+
+    async def _find_existing_job(self, analyzer: str, md5: str) -> Optional[int]:
+        """
+        Return the id of a recent IntelOwl job for this file/analyzer, if any
+
+        Bounded by settings.ANALYSIS_REUSE_MINUTES (0 disables reuse), and only
+        running or clean jobs qualify so failed analyses are retried.
+        """
+        if settings.ANALYSIS_REUSE_MINUTES <= 0:
+            return None
+
+        try:
+            availability = await self.service.ask_analysis_availability(
+                md5,
+                analyzers=[analyzer],
+                minutes_ago=settings.ANALYSIS_REUSE_MINUTES
+            )
+        except Exception as e:
+            logger.debug(f"Availability lookup failed for {analyzer}/{md5}: {e}")
+            return None
+
+        if availability.get("status") in REUSABLE_STATUSES:
+            return availability.get("job_id")
+        return None
 
     async def test_analyzer_on_file(self, analyzer: str, file_path: Path, category: str) -> Dict[str, Any]:
         """Test a single analyzer on a single file"""
         try:
             logger.info(f"Testing {analyzer} on {category}/{file_path.name}")
 
-            # Submit analysis
-            job_id = await self.service.submit_file_analysis(
-                file_path=str(file_path),
-                analyzers=[analyzer],
-                file_name=file_path.name,
-                tlp="CLEAR"
-            )
+            # Reuse an existing job for identical content before uploading again
+            md5 = self._md5(file_path)
+            job_id = self._job_cache.get((analyzer, md5))
+            if job_id is None:
+                job_id = await self._find_existing_job(analyzer, md5)
+            if job_id is None:
+                job_id = await self.service.submit_file_analysis(
+                    file_path=str(file_path),
+                    analyzers=[analyzer],
+                    file_name=file_path.name,
+                    tlp="CLEAR"
+                )
+            else:
+                logger.info(f"Reusing job {job_id} for {analyzer} on {file_path.name}")
+            self._job_cache[(analyzer, md5)] = job_id
 
             # Wait for completion
             result = await self.service.wait_for_completion(job_id, timeout=60)
 
-            return {
+            return self._record({
                 "analyzer": analyzer,
                 "file": file_path.name,
                 "category": category,
                 "job_id": job_id,
                 "success": True,
                 "result": result
-            }
+            })
 
         except Exception as e:
             logger.error(f"Failed {analyzer} on {file_path.name}: {e}")
-            return {
+            return self._record({
                 "analyzer": analyzer,
                 "file": file_path.name,
                 "category": category,
                 "success": False,
                 "error": str(e)
-            }
+            })
+
+    def _record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Hand a finished test record to the background writer"""
+        if self._write_q is not None:
+            self._write_q.put_nowait(record)
+        return record
+
+    async def _writer_loop(self, queue: asyncio.Queue, output_file: Path):
+        """Append queued records to a JSONL file until the None sentinel arrives"""
+        with open(output_file, 'w') as f:
+            while True:
+                record = await queue.get()
+                if record is None:
+                    return
+                f.write(json.dumps(record, default=str) + "\n")
+                f.flush()
 
     async def test_all_analyzers_on_category(self, category: str) -> List[Dict[str, Any]]:
         """Test all analyzers on all files in a category (safe/malicious)"""
@@ -178,6 +256,10 @@ class AnalyzerTester:
         """Run all tests and collect results"""
         logger.info("Starting comprehensive analyzer testing")
 
+        stream_file = self.responses_dir / "comprehensive_test_results.jsonl"
+        self._write_q = asyncio.Queue()
+        self._writer = asyncio.create_task(self._writer_loop(self._write_q, stream_file))
+
         all_results = {
             "metadata": {
                 "analyzers_tested": ANALYZERS,
@@ -187,15 +269,23 @@ class AnalyzerTester:
             "results": []
         }
 
-        # Test safe samples
-        logger.info("Testing SAFE samples...")
-        safe_results = await self.test_all_analyzers_on_category("safe")
-        all_results["results"].extend(safe_results)
-
-        # Test malicious samples
-        logger.info("Testing MALICIOUS samples...")
-        malicious_results = await self.test_all_analyzers_on_category("malicious")
-        all_results["results"].extend(malicious_results)
+        try:
+            # Test safe samples
+            logger.info("Testing SAFE samples...")
+            safe_results = await self.test_all_analyzers_on_category("safe")
+            all_results["results"].extend(safe_results)
+
+            # Test malicious samples
+            logger.info("Testing MALICIOUS samples...")
+            malicious_results = await self.test_all_analyzers_on_category("malicious")
+            all_results["results"].extend(malicious_results)
+        finally:
+            # Stop the writer once it has drained the queue; awaiting it
+            # re-raises anything that killed it (e.g. an unwritable stream_file)
+            self._write_q.put_nowait(None)
+            self._write_q = None
+            await self._writer
+        logger.info(f"Streamed results to {stream_file}")
 
         return all_results
 
@@ -274,10 +364,11 @@ class AnalyzerTester:
 
     def _extract_response_info(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """Extract key information from analyzer response"""
+        keys = set(_walk_keys(result))
         info = {
-            "has_report": "report" in str(result),
-            "has_errors": "errors" in str(result) or "error" in str(result),
-            "has_success": "success" in str(result),
+            "has_report": "report" in keys,
+            "has_errors": bool(keys & {"errors", "error"}),
+            "has_success": "success" in keys,
             "response_keys": list(result.keys()) if isinstance(result, dict) else []
         }
 
@@ -306,8 +397,8 @@ async def main():
     # Run comprehensive tests
     results = await tester.run_comprehensive_tests()
 
-    # Save raw results
-    tester.save_results(results)
+    # Save raw results off the event loop while the analysis runs
+    save_task = asyncio.create_task(asyncio.to_thread(tester.save_results, results))
 
     # Analyze results
     analysis = tester.analyze_results(results)
@@ -332,5 +423,7 @@ async def main():
         for error in analysis['error_analysis'][:5]:  # Show first 5
             print(f"  {error['analyzer']} on {error['file']}: {error['error']}")
 
+    await save_task
+
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
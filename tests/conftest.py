@@ -3,28 +3,85 @@ ThreatFlow Test Configuration
 Provides fixtures and utilities for comprehensive workflow testing
 """
 
+import asyncio
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import copy
+import functools
+import hashlib
+import io
+import itertools
 import json
+import logging
 import os
+import pickle
+import sys
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, Callable, BinaryIO, Union, FrozenSet, Iterable
+from dataclasses import dataclass, field
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib
+    _dumps = json.dumps
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
 
 # Configuration
 MIDDLEWARE_URL = os.getenv("MIDDLEWARE_URL", "http://localhost:8030")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
+# (connect, read) timeouts: fail fast on a dead socket, wait longer on a busy server
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 27
+
+# Samples above this size are streamed from an open file instead of read into memory
+STREAM_THRESHOLD = 64 * 1024
+
+# Consecutive network failures while polling before the middleware is declared gone
+MAX_TRANSIENT_FAILURES = 5
+
 # Test sample paths
 TEST_SAMPLES_DIR = Path(__file__).parent.parent / "testing_responses" / "Malware safe Malware samples"
 SAFE_SAMPLES_DIR = TEST_SAMPLES_DIR / "safe"
 MALICIOUS_SAMPLES_DIR = TEST_SAMPLES_DIR / "malicious"
 
 
-@dataclass
+def _build_session() -> requests.Session:
+    """Create a keep-alive session with a connection pool and transient retries"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every test client so pooled TCP connections are reused across the run
+HTTP_SESSION = _build_session()
+
+
+@dataclass(slots=True, frozen=True)
 class WorkflowResult:
-    """Result of a workflow execution test"""
+    """
+    Result of a workflow execution test
+    
+    Fields are plain references, read without copying. Memoized results are
+    shared between tests, so a test that needs to modify the results should
+    work on results_copy().
+    """
     success: bool
     job_id: Optional[int]
     has_conditionals: bool
@@ -33,6 +90,38 @@ class WorkflowResult:
     stage_routing: List[Dict]
     results: Optional[Dict]
     error: Optional[str]
+    _by_node: Optional[Dict[str, List[str]]] = field(default=None, init=False, repr=False, compare=False)
+    _reports: Dict[str, Dict] = field(init=False, repr=False, compare=False)
+    _names: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Index analyzer reports by name once; the per-node routing index is built on demand"""
+        reports: Dict[str, Dict] = {}
+        if self.results and isinstance(self.results.get('analyzer_reports'), list):
+            for report in self.results['analyzer_reports']:
+                if report.get('name'):
+                    reports.setdefault(report['name'], report)
+        
+        # Frozen dataclass: derived fields are set through object.__setattr__
+        object.__setattr__(self, '_reports', reports)
+        object.__setattr__(self, '_names', frozenset(reports))
+    
+    def _routing_index(self) -> Dict[str, List[str]]:
+        """Analyzer names per result node, built from stage_routing on first use"""
+        if self._by_node is None:
+            by_node: Dict[str, List[str]] = {}
+            for stage in self.stage_routing:
+                analyzers = stage.get('analyzers', [])
+                for node_id in stage.get('target_nodes', []):
+                    by_node.setdefault(node_id, []).extend(analyzers)
+            
+            # Analyzer reports are overlaid onto every node, known or not
+            report_names = list(self._reports)
+            object.__setattr__(self, '_by_node', {
+                node_id: list(dict.fromkeys(analyzers + report_names))
+                for node_id, analyzers in by_node.items()
+            })
+        return self._by_node
     
     def get_result_node_analyzers(self, result_node_id: str) -> List[str]:
         """
@@ -45,74 +134,76 @@ class WorkflowResult:
         Returns:
             List of analyzer names that were routed to this result node
         """
-        analyzer_names = []
-        
-        # Check stage_routing for analyzers routed to this result node
-        for stage in self.stage_routing:
-            target_nodes = stage.get('target_nodes', [])
-            if result_node_id in target_nodes:
-                analyzers = stage.get('analyzers', [])
-                analyzer_names.extend(analyzers)
-        
-        # Also check results if available
-        if self.results and 'analyzer_reports' in self.results:
-            reports = self.results['analyzer_reports']
-            if isinstance(reports, list):
-                for report in reports:
-                    analyzer_name = report.get('name')
-                    if analyzer_name and analyzer_name not in analyzer_names:
-                        analyzer_names.append(analyzer_name)
-        
-        return analyzer_names
+        return list(self._routing_index().get(result_node_id, self._reports))
+    
+    @property
+    def analyzer_reports(self) -> Dict[str, Dict]:
+        """Analyzer reports keyed by analyzer name (the first report per name wins)"""
+        return self._reports
+    
+    @property
+    def analyzer_names(self) -> FrozenSet[str]:
+        """Names of the analyzers that reported, computed once per result"""
+        return self._names
+    
+    def results_copy(self) -> Optional[Dict]:
+        """Deep copy of the raw results, safe to mutate"""
+        return copy.deepcopy(self.results)
+
+
+# Per-type node data templates; builders copy these and fill in the varying fields
+_FILE_DATA = {"label": "File Upload", "file": None, "fileName": "", "fileSize": 0}
+_ANALYZER_DATA = {"label": "Analyzer", "analyzer": None, "analyzerType": "file", "description": ""}
+_CONDITIONAL_DATA = {"label": "Conditional", "conditionType": None, "sourceAnalyzer": None}
+_RESULT_DATA = {"label": "Results", "jobId": None, "status": "idle", "results": None, "error": None}
+
+
+@functools.lru_cache(maxsize=None)
+def _analyzer_spec(analyzer: str) -> Dict:
+    """Analyzer node data for one analyzer, built once per name (copied per node)"""
+    data = _ANALYZER_DATA.copy()
+    data["analyzer"] = sys.intern(analyzer)
+    data["description"] = f"{analyzer} analyzer"
+    return data
+
+
+# Default canvas coordinates per node type, used for any omitted x/y
+_LAYOUT_DEFAULTS = {"file": (100, 200), "analyzer": (300, 200), "conditional": (500, 200), "result": (700, 200)}
 
 
 class WorkflowBuilder:
     """
     Helper class to build workflow node/edge structures
     Mimics how the frontend creates workflows
+    
+    Coordinates are optional: an omitted x or y falls back to the node type's
+    default column in _LAYOUT_DEFAULTS.
     """
     
     def __init__(self):
         self.nodes = []
         self.edges = []
-        self.node_counter = 0
-        self.edge_counter = 0
+        self._node_ids = itertools.count()
+        self._edge_ids = itertools.count()
     
-    def add_file_node(self, x: float = 100, y: float = 200) -> str:
-        """Add a file input node"""
-        node_id = f"file-{self.node_counter}"
-        self.node_counter += 1
-        
+    def _add_node(self, node_type: str, x: Optional[float], y: Optional[float], data: Dict) -> str:
+        node_id = f"{node_type}-{next(self._node_ids)}"
+        default_x, default_y = _LAYOUT_DEFAULTS[node_type]
         self.nodes.append({
             "id": node_id,
-            "type": "file",
-            "position": {"x": x, "y": y},
-            "data": {
-                "label": "File Upload",
-                "file": None,
-                "fileName": "",
-                "fileSize": 0
-            }
+            "type": node_type,
+            "position": {"x": default_x if x is None else x, "y": default_y if y is None else y},
+            "data": data
         })
         return node_id
     
-    def add_analyzer_node(self, analyzer: str, x: float = 300, y: float = 200) -> str:
+    def add_file_node(self, x: Optional[float] = None, y: Optional[float] = None) -> str:
+        """Add a file input node"""
+        return self._add_node("file", x, y, _FILE_DATA.copy())
+    
+    def add_analyzer_node(self, analyzer: str, x: Optional[float] = None, y: Optional[float] = None) -> str:
         """Add an analyzer node"""
-        node_id = f"analyzer-{self.node_counter}"
-        self.node_counter += 1
-        
-        self.nodes.append({
-            "id": node_id,
-            "type": "analyzer",
-            "position": {"x": x, "y": y},
-            "data": {
-                "label": "Analyzer",
-                "analyzer": analyzer,
-                "analyzerType": "file",
-                "description": f"{analyzer} analyzer"
-            }
-        })
-        return node_id
+        return self._add_node("analyzer", x, y, _analyzer_spec(analyzer).copy())
     
     def add_conditional_node(
         self,
@@ -120,55 +211,39 @@ class WorkflowBuilder:
         source_analyzer: str,
         field_path: str = None,
         expected_value: Any = None,
-        x: float = 500,
-        y: float = 200
+        x: Optional[float] = None,
+        y: Optional[float] = None,
+        expected_branch: Optional[str] = None
     ) -> str:
-        """Add a conditional branching node"""
-        node_id = f"conditional-{self.node_counter}"
-        self.node_counter += 1
+        """
+        Add a conditional branching node
         
-        data = {
-            "label": "Conditional",
-            "conditionType": condition_type,
-            "sourceAnalyzer": source_analyzer
-        }
+        expected_branch ("true"/"false") is an optimization hint: the middleware may
+        start that branch's analyzers early. A wrong hint only costs a killed job.
+        """
+        data = _CONDITIONAL_DATA.copy()
+        data["conditionType"] = condition_type
+        data["sourceAnalyzer"] = source_analyzer
         
         if field_path:
             data["fieldPath"] = field_path
         if expected_value is not None:
             data["expectedValue"] = expected_value
+        if expected_branch:
+            data["expectedBranch"] = expected_branch
         
-        self.nodes.append({
-            "id": node_id,
-            "type": "conditional",
-            "position": {"x": x, "y": y},
-            "data": data
-        })
-        return node_id
+        return self._add_node("conditional", x, y, data)
     
-    def add_result_node(self, x: float = 700, y: float = 200, label: str = "Results") -> str:
+    def add_result_node(self, x: Optional[float] = None, y: Optional[float] = None, label: str = "Results") -> str:
         """Add a result display node"""
-        node_id = f"result-{self.node_counter}"
-        self.node_counter += 1
+        data = _RESULT_DATA.copy()
+        data["label"] = label
         
-        self.nodes.append({
-            "id": node_id,
-            "type": "result",
-            "position": {"x": x, "y": y},
-            "data": {
-                "label": label,
-                "jobId": None,
-                "status": "idle",
-                "results": None,
-                "error": None
-            }
-        })
-        return node_id
+        return self._add_node("result", x, y, data)
     
     def connect(self, source_id: str, target_id: str, source_handle: str = None, target_handle: str = None) -> str:
         """Connect two nodes with an edge"""
-        edge_id = f"edge-{self.edge_counter}"
-        self.edge_counter += 1
+        edge_id = f"edge-{next(self._edge_ids)}"
         
         edge = {
             "id": edge_id,
@@ -184,16 +259,144 @@ class WorkflowBuilder:
         self.edges.append(edge)
         return edge_id
     
+    def connect_many(self, pairs: Iterable[Tuple]) -> List[str]:
+        """
+        Connect several nodes in one call
+        
+        Args:
+            pairs: (source_id, target_id[, source_handle]) tuples; a None handle is omitted
+        
+        Returns:
+            The new edge IDs, in order
+        """
+        new_edges = []
+        for source_id, target_id, *handle in pairs:
+            edge = {"id": f"edge-{next(self._edge_ids)}", "source": source_id, "target": target_id}
+            if handle and handle[0]:
+                edge["sourceHandle"] = handle[0]
+            new_edges.append(edge)
+        
+        self.edges.extend(new_edges)
+        return [edge["id"] for edge in new_edges]
+    
+    def connect_chain(self, *node_ids: str, source_handle: str = None) -> List[str]:
+        """
+        Connect node_ids[0] → node_ids[1] → ... in order
+        
+        source_handle applies to the first edge only, e.g. to start a chain on a
+        conditional's "true-output".
+        """
+        return self.connect_many(
+            (source_id, target_id, source_handle if i == 0 else None)
+            for i, (source_id, target_id) in enumerate(zip(node_ids, node_ids[1:]))
+        )
+    
     def get_workflow(self) -> Tuple[List[Dict], List[Dict]]:
         """Get the workflow nodes and edges"""
         return self.nodes, self.edges
     
+    def add_from_spec(self, spec: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Add nodes and edges from a declarative spec
+        
+        Args:
+            spec: {"nodes": {name: {"type": "analyzer", **add_analyzer_node kwargs}, ...},
+                   "edges": [(src_name, dst_name[, source_handle]), ...]}
+        
+        Returns:
+            Mapping of spec node names to the generated node IDs
+        """
+        ids = {}
+        for name, node in spec["nodes"].items():
+            kwargs = dict(node)
+            ids[name] = getattr(self, f"add_{kwargs.pop('type')}_node")(**kwargs)
+        self.connect_many((ids[source], ids[target], *handle) for source, target, *handle in spec["edges"])
+        return ids
+    
     def reset(self):
         """Reset the builder"""
-        self.nodes = []
-        self.edges = []
-        self.node_counter = 0
-        self.edge_counter = 0
+        self.__init__()
+    
+    def clone(self) -> "WorkflowBuilder":
+        """
+        Copy this builder's topology without replaying the add_* calls
+        
+        Nodes (including their data and position) and edges are copied, so the
+        clone can be extended or mutated independently.
+        """
+        new = WorkflowBuilder()
+        new.nodes = [
+            {key: dict(value) if isinstance(value, dict) else value for key, value in node.items()}
+            for node in self.nodes
+        ]
+        new.edges = [dict(edge) for edge in self.edges]
+        # One ID is drawn per node/edge, so the counters resume at the list lengths
+        new._node_ids = itertools.count(len(self.nodes))
+        new._edge_ids = itertools.count(len(self.edges))
+        return new
+    
+    def freeze(self, ids: Optional[Dict[str, str]] = None) -> "FrozenBuilder":
+        """
+        Snapshot the current topology as a shareable prefix
+        
+        Args:
+            ids: Optional names for prefix node IDs, exposed as FrozenBuilder.ids
+        """
+        return FrozenBuilder(self, ids)
+
+
+class FrozenBuilder:
+    """
+    Immutable workflow prefix that tests fork() and extend with their own tail
+    
+    Forks get their own node/edge lists but share the prefix's node and edge
+    dicts, so prefix nodes must not be mutated in place; use
+    WorkflowBuilder.clone() when a test needs that.
+    """
+    
+    def __init__(self, builder: WorkflowBuilder, ids: Optional[Dict[str, str]] = None):
+        self._nodes = tuple(builder.nodes)
+        self._edges = tuple(builder.edges)
+        self.ids = dict(ids or {})
+    
+    def fork(self) -> WorkflowBuilder:
+        """Get a builder that starts from this prefix"""
+        new = WorkflowBuilder()
+        new.nodes = list(self._nodes)
+        new.edges = list(self._edges)
+        new._node_ids = itertools.count(len(self._nodes))
+        new._edge_ids = itertools.count(len(self._edges))
+        return new
+
+
+class DiskResultCache:
+    """
+    Result cache stored as one pickle per key, shared by pytest-xdist workers
+    
+    Entries are written to a temp file and renamed into place, so concurrent
+    workers never read a partial entry; the last writer of a key wins.
+    """
+    
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, key: Tuple[str, str]) -> Path:
+        return self.directory / hashlib.sha256(repr(key).encode()).hexdigest()
+    
+    def get(self, key: Tuple[str, str], default: Any = None) -> Any:
+        try:
+            with open(self._path(key), 'rb') as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return default
+    
+    def __setitem__(self, key: Tuple[str, str], value: Any) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
 
 
 class WorkflowTester:
@@ -201,9 +404,17 @@ class WorkflowTester:
     Executes workflows against the middleware and validates results
     """
     
-    def __init__(self, middleware_url: str = MIDDLEWARE_URL):
+    def __init__(
+        self,
+        middleware_url: str = MIDDLEWARE_URL,
+        session: Optional[requests.Session] = None,
+        result_cache: Optional[Union[Dict[Tuple[str, str], WorkflowResult], DiskResultCache]] = None
+    ):
         self.middleware_url = middleware_url
-        self.session = requests.Session()
+        self.session = session or HTTP_SESSION
+        # (sample sha256, workflow key) -> successful result; None disables memoization
+        self.result_cache = result_cache
+        self._digests: Dict[Tuple[str, int, int], str] = {}
     
     def execute_workflow(
         self,
@@ -211,7 +422,9 @@ class WorkflowTester:
         edges: List[Dict],
         file_path: str,
         timeout: int = 300,
-        poll_interval: int = 5
+        poll_interval: float = 0.5,
+        initial_delay: float = 0.2,
+        long_poll: int = 30
     ) -> WorkflowResult:
         """
         Execute a workflow and wait for completion
@@ -221,42 +434,120 @@ class WorkflowTester:
             edges: Workflow edges
             file_path: Path to the file to analyze
             timeout: Maximum wait time in seconds
-            poll_interval: Time between status checks
+            poll_interval: Upper bound on the time between status checks
+            initial_delay: First backoff delay; grows 1.7x per poll up to poll_interval
+            long_poll: Seconds the middleware may hold each status request (0 disables)
         
         Returns:
             WorkflowResult with execution details
         """
         try:
-            # Read file
-            if not os.path.exists(file_path):
-                return WorkflowResult(
-                    success=False,
-                    job_id=None,
-                    has_conditionals=False,
-                    executed_stages=[],
-                    skipped_stages=[],
-                    stage_routing=[],
-                    results=None,
-                    error=f"File not found: {file_path}"
-                )
-            
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return self._file_not_found(file_path)
+        
+        key = None
+        if self.result_cache is not None:
+            key = (self._sample_digest(file_path, st), self._workflow_key(nodes, edges))
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        result = self._execute(
+            _dumps({'nodes': nodes, 'edges': edges}),
+            os.path.basename(file_path), self._sample_opener(file_path, st.st_size),
+            timeout, poll_interval, initial_delay, long_poll
+        )
+        if key is not None and result.success:
+            self.result_cache[key] = result
+        return result
+    
+    async def execute_workflow_async(self, nodes: List[Dict], edges: List[Dict], file_path: str, **kwargs) -> WorkflowResult:
+        """
+        Awaitable execute_workflow, so several runs can overlap under asyncio.gather
+        
+        The blocking submit/poll loop runs in a worker thread on the shared
+        keep-alive session; keyword arguments are passed through unchanged.
+        """
+        return await asyncio.to_thread(self.execute_workflow, nodes, edges, file_path, **kwargs)
+    
+    def execute_workflows(self, cases: List[Tuple[List[Dict], List[Dict], str]], **kwargs) -> List[WorkflowResult]:
+        """
+        Execute several (nodes, edges, file_path) workflows concurrently
+        
+        Returns:
+            WorkflowResults in the same order as cases
+        """
+        async def run_all():
+            return await asyncio.gather(*[
+                self.execute_workflow_async(nodes, edges, file_path, **kwargs)
+                for nodes, edges, file_path in cases
+            ])
+        
+        return list(asyncio.run(run_all()))
+    
+    def _sample_digest(self, file_path: str, st: os.stat_result) -> str:
+        """SHA-256 of a sample, hashed once per (path, size, mtime)"""
+        stamp = (file_path, st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(stamp)
+        if digest is None:
             with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            file_name = os.path.basename(file_path)
-            
-            # Prepare request
-            files = {'file': (file_name, file_content, 'application/octet-stream')}
-            workflow_json = json.dumps({'nodes': nodes, 'edges': edges})
+                digest = hashlib.file_digest(f, 'sha256').hexdigest()
+            self._digests[stamp] = digest
+        return digest
+    
+    @staticmethod
+    def _workflow_key(nodes: List[Dict], edges: List[Dict]) -> str:
+        """Canonical form of a workflow; layout (positions, edge ids) does not affect execution"""
+        return json.dumps([
+            sorted([n['id'], n['type'], n.get('data', {})] for n in nodes),
+            sorted([e['source'], e['target'], e.get('sourceHandle') or '', e.get('targetHandle') or ''] for e in edges)
+        ], sort_keys=True, separators=(',', ':'))
+    
+    @staticmethod
+    def _sample_opener(file_path: str, size: int) -> Callable[[], BinaryIO]:
+        """Stream large samples from disk; read small ones in a single call"""
+        if size > STREAM_THRESHOLD:
+            return lambda: open(file_path, 'rb')
+        return lambda: io.BytesIO(Path(file_path).read_bytes())
+    
+    @staticmethod
+    def _file_not_found(file_path: str) -> WorkflowResult:
+        """Result for a sample path that does not exist"""
+        return WorkflowResult(
+            success=False,
+            job_id=None,
+            has_conditionals=False,
+            executed_stages=[],
+            skipped_stages=[],
+            stage_routing=[],
+            results=None,
+            error=f"File not found: {file_path}"
+        )
+    
+    def _execute(
+        self,
+        workflow_json: Union[str, bytes],
+        file_name: str,
+        open_file: Callable[[], BinaryIO],
+        timeout: int,
+        poll_interval: float,
+        initial_delay: float,
+        long_poll: int
+    ) -> WorkflowResult:
+        """Submit a workflow with the sample from open_file() and poll until it finishes"""
+        try:
             data = {'workflow_json': workflow_json}
             
-            # Submit workflow
-            response = self.session.post(
-                f"{self.middleware_url}/api/execute",
-                files=files,
-                data=data,
-                timeout=30
-            )
+            # Submit workflow, handing requests the open file instead of a bytes copy
+            with open_file() as file_handle:
+                files = {'file': (file_name, file_handle, 'application/octet-stream')}
+                response = self.session.post(
+                    f"{self.middleware_url}/api/execute",
+                    files=files,
+                    data=data,
+                    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+                )
             
             if response.status_code != 200:
                 return WorkflowResult(
@@ -270,7 +561,7 @@ class WorkflowTester:
                     error=f"Submission failed: {response.status_code} - {response.text}"
                 )
             
-            result = response.json()
+            result = _loads(response.content)
             job_id = result.get('job_id') or (result.get('job_ids') and result['job_ids'][0])
             has_conditionals = result.get('has_conditionals', False)
             stage_routing = result.get('stage_routing', [])
@@ -287,17 +578,31 @@ class WorkflowTester:
                     error="No job ID in response"
                 )
             
-            # Poll for completion
-            max_attempts = timeout // poll_interval
-            for attempt in range(max_attempts):
+            # Poll for completion with exponential backoff bounded by the deadline
+            deadline = time.monotonic() + timeout
+            delay = initial_delay
+            transient_failures = 0
+            while time.monotonic() < deadline:
+                wait = min(long_poll, max(0, int(deadline - time.monotonic())))
+                held = False
                 try:
+                    requested_at = time.monotonic()
                     status_response = self.session.get(
                         f"{self.middleware_url}/api/status/{job_id}",
-                        timeout=10
+                        params={'wait': wait} if wait else None,
+                        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT + wait)
                     )
+                    # A server that honours ?wait= already spent the delay for us
+                    held = wait > 0 and time.monotonic() - requested_at >= wait * 0.9
                     
-                    if status_response.status_code == 200:
-                        status_data = status_response.json()
+                    transient_failures = 0
+                    
+                    if status_response.status_code in (400, 422) and wait:
+                        long_poll = 0  # Server rejects ?wait=, use plain backoff
+                    else:
+                        # Anything other than a 2xx is a real failure, not a reason to re-poll
+                        status_response.raise_for_status()
+                        status_data = _loads(status_response.content)
                         status = status_data.get('status')
                         
                         if status in ['reported_without_fails', 'reported_with_fails']:
@@ -322,10 +627,36 @@ class WorkflowTester:
                                 results=status_data.get('results'),
                                 error="Analysis failed"
                             )
-                except Exception as e:
-                    pass  # Continue polling
-                
-                time.sleep(poll_interval)
+                except (requests.Timeout, requests.ConnectionError) as e:
+                    transient_failures += 1
+                    logger.debug(f"Status poll for job {job_id} failed ({transient_failures}): {e}")
+                    if transient_failures >= MAX_TRANSIENT_FAILURES:
+                        return WorkflowResult(
+                            success=False,
+                            job_id=job_id,
+                            has_conditionals=has_conditionals,
+                            executed_stages=result.get('executed_stages', []),
+                            skipped_stages=result.get('skipped_stages', []),
+                            stage_routing=stage_routing,
+                            results=None,
+                            error="middleware unreachable"
+                        )
+                except (requests.HTTPError, ValueError) as e:
+                    # Non-2xx status or an unparseable body: keep the job context in the result
+                    return WorkflowResult(
+                        success=False,
+                        job_id=job_id,
+                        has_conditionals=has_conditionals,
+                        executed_stages=result.get('executed_stages', []),
+                        skipped_stages=result.get('skipped_stages', []),
+                        stage_routing=stage_routing,
+                        results=None,
+                        error=f"Status poll failed: {e}"
+                    )
+
+                if not held:
+                    time.sleep(max(0, min(delay, deadline - time.monotonic())))
+                    delay = min(delay * 1.7, poll_interval)
             
             return WorkflowResult(
                 success=False,
@@ -355,16 +686,29 @@ class WorkflowTester:
         try:
             response = self.session.get(f"{self.middleware_url}/health/", timeout=5)
             return response.status_code == 200
-        except:
+        except requests.RequestException:
             return False
 
 
 # Pytest fixtures
 
 @pytest.fixture(scope="session")
-def workflow_tester():
+def result_cache(tmp_path_factory):
+    """
+    Successful workflow results keyed by (sample sha256, workflow), shared across the session
+    
+    Under pytest-xdist the cache lives on disk in the run's shared base temp
+    directory, so every worker reuses results the others already produced.
+    """
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        return DiskResultCache(tmp_path_factory.getbasetemp().parent / "workflow_results")
+    return {}
+
+
+@pytest.fixture(scope="session")
+def workflow_tester(result_cache):
     """Provide a workflow tester instance"""
-    tester = WorkflowTester()
+    tester = WorkflowTester(result_cache=result_cache)
     if not tester.health_check():
         pytest.skip("Middleware not available")
     return tester
@@ -376,22 +720,70 @@ def workflow_builder():
     return WorkflowBuilder()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def clamav_prefix_builder():
+    """
+    Frozen File → ClamAV → [verdict_malicious] prefix
+    
+    Node IDs are available as ids["file"], ids["clamav"] and ids["conditional"].
+    """
+    builder = WorkflowBuilder()
+    ids = {
+        "file": builder.add_file_node(),
+        "clamav": builder.add_analyzer_node("ClamAV", x=300),
+    }
+    ids["conditional"] = builder.add_conditional_node(
+        condition_type="verdict_malicious",
+        source_analyzer="ClamAV",
+        x=500
+    )
+    builder.connect(ids["file"], ids["clamav"])
+    builder.connect(ids["clamav"], ids["conditional"])
+    return builder.freeze(ids)
+
+
+@pytest.fixture(scope="session")
+def dag_factory():
+    """
+    Build (nodes, edges, ids) from a declarative spec (see WorkflowBuilder.add_from_spec)
+    
+    Each distinct spec is built once per session; later calls hand out a clone of
+    that topology, so parametrized tests never replay the add_* calls and may
+    mutate what they get back.
+    """
+    built: Dict[str, Tuple[WorkflowBuilder, Dict[str, str]]] = {}
+    
+    def build(spec: Dict[str, Any]) -> Tuple[List[Dict], List[Dict], Dict[str, str]]:
+        key = json.dumps(spec, sort_keys=True)
+        if key not in built:
+            builder = WorkflowBuilder()
+            built[key] = (builder, builder.add_from_spec(spec))
+        builder, ids = built[key]
+        return (*builder.clone().get_workflow(), dict(ids))
+    
+    return build
+
+
+@pytest.fixture(scope="session")
 def safe_sample_path():
     """Provide path to a safe test file"""
     path = SAFE_SAMPLES_DIR / "test.txt"
-    if not path.exists():
+    try:
+        path.stat()
+    except FileNotFoundError:
         # Create a simple test file
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text("This is a safe test file.")
     return str(path)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def malicious_sample_path():
     """Provide path to an EICAR test file"""
     path = MALICIOUS_SAMPLES_DIR / "eicar.com"
-    if not path.exists():
+    try:
+        path.stat()
+    except FileNotFoundError:
         # Create EICAR test file
         path.parent.mkdir(parents=True, exist_ok=True)
         eicar = r"X5O!P%@AP[4\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
@@ -399,13 +791,13 @@ def malicious_sample_path():
     return str(path)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pdf_safe_path():
     """Path to safe PDF sample"""
     return str(SAFE_SAMPLES_DIR / "safe.pdf")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pdf_malicious_path():
     """Path to malicious PDF sample"""
     return str(MALICIOUS_SAMPLES_DIR / "malicious.pdf")
@@ -24,10 +24,17 @@ echo ""
 # Check if pytest is installed
 if ! command -v pytest &> /dev/null; then
     echo -e "${RED}Error: pytest is not installed${NC}"
-    echo "Install with: pip install pytest pytest-timeout"
+    echo "Install with: pip install pytest pytest-timeout pytest-xdist"
     exit 1
 fi
 
+# Integration tests mostly wait on IntelOwl; spread them across workers when
+# pytest-xdist is installed (loadgroup honours the xdist_group marks)
+XDIST_ARGS=()
+if pytest --help 2>/dev/null | grep -q -- "--numprocesses"; then
+    XDIST_ARGS=(-n auto --dist loadgroup)
+fi
+
 # Check middleware health
 check_middleware() {
     echo -e "${YELLOW}Checking middleware health...${NC}"
@@ -61,7 +68,7 @@ run_integration_tests() {
            "${SCRIPT_DIR}/test_conditional_workflows.py" \
            "${SCRIPT_DIR}/test_combined_workflows.py" \
            "${SCRIPT_DIR}/test_api_integration.py" \
-           -v --tb=short "$@"
+           "${XDIST_ARGS[@]}" -v --tb=short "$@"
 }
 
 # Run specific test file
@@ -115,7 +122,7 @@ case "${1:-all}" in
         ;;
     linear)
         shift || true
-        check_middleware && pytest "${SCRIPT_DIR}/test_linear_workflows.py" -v "$@"
+        check_middleware && pytest "${SCRIPT_DIR}/test_linear_workflows.py" "${XDIST_ARGS[@]}" -v "$@"
         ;;
     conditional)
         shift || true
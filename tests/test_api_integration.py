@@ -5,21 +5,59 @@ End-to-end tests that verify backend API behavior
 
 import pytest
 import requests
+import json
 import time
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
+
+from conftest import HTTP_SESSION
 
 # API Configuration
 API_BASE_URL = os.environ.get("THREATFLOW_API_URL", "http://localhost:8001")
 
+def _conditional_workflow(
+    analyzer: str,
+    condition_type: str,
+    true_result: str = "result-true",
+    false_result: str = "result-false"
+) -> Dict:
+    """File → analyzer → [condition] → TRUE/FALSE result nodes"""
+    return {
+        "nodes": [
+            {"id": "file-1", "type": "file", "data": {}, "position": {"x": 100, "y": 200}},
+            {"id": "analyzer-1", "type": "analyzer", "data": {"analyzer": analyzer}, "position": {"x": 300, "y": 200}},
+            {"id": "cond-1", "type": "conditional", "data": {"conditionType": condition_type, "sourceAnalyzer": analyzer}, "position": {"x": 500, "y": 200}},
+            {"id": true_result, "type": "result", "data": {}, "position": {"x": 700, "y": 100}},
+            {"id": false_result, "type": "result", "data": {}, "position": {"x": 700, "y": 300}}
+        ],
+        "edges": [
+            {"id": "e1", "source": "file-1", "target": "analyzer-1"},
+            {"id": "e2", "source": "analyzer-1", "target": "cond-1"},
+            {"id": "e3", "source": "cond-1", "target": true_result, "sourceHandle": "true-output"},
+            {"id": "e4", "source": "cond-1", "target": false_result, "sourceHandle": "false-output"}
+        ]
+    }
+
+
+# Fixed-shape conditional workflows, serialized once and keyed by scenario
+_COND_WF_JSON = {
+    "clamav_verdict_malicious": json.dumps(
+        _conditional_workflow("ClamAV", "verdict_malicious"), separators=(',', ':')
+    ),
+    "file_info_analyzer_success": json.dumps(
+        _conditional_workflow("File_Info", "analyzer_success", "result-1", "result-2"), separators=(',', ':')
+    ),
+}
+
 
 class APIClient:
     """HTTP client for ThreatFlow middleware API"""
     
-    def __init__(self, base_url: str = API_BASE_URL):
+    def __init__(self, base_url: str = API_BASE_URL, session: Optional[requests.Session] = None):
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
+        self.session = session or HTTP_SESSION
+        self._analyzers_cache: Optional[List[str]] = None
     
     def health_check(self) -> bool:
         """Check if API is reachable"""
@@ -29,12 +67,12 @@ class APIClient:
         except requests.exceptions.RequestException:
             return False
     
-    def execute_workflow(self, workflow: Dict, file_path: str, timeout: int = 120) -> Dict:
+    def execute_workflow(self, workflow: Union[Dict, str, bytes], file_path: str, timeout: int = 120) -> Dict:
         """
         Execute a workflow and wait for results
         
         Args:
-            workflow: Dict containing 'nodes' and 'edges'
+            workflow: Dict containing 'nodes' and 'edges', or its pre-serialized JSON
             file_path: Path to file to analyze
             timeout: Max seconds to wait
             
@@ -42,17 +80,18 @@ class APIClient:
             Dict with execution results
         """
         endpoint = f"{self.base_url}/api/workflow/execute"
+        if isinstance(workflow, dict):
+            workflow_json = json.dumps(workflow, separators=(',', ':'))
+        else:
+            workflow_json = workflow
         
         with open(file_path, 'rb') as f:
             files = {'file': (os.path.basename(file_path), f)}
-            data = {
-                'workflow': workflow
-            }
             
             response = self.session.post(
                 endpoint,
                 files=files,
-                data={'workflow': str(workflow)},
+                data={'workflow_json': workflow_json},
                 timeout=timeout
             )
         
@@ -65,14 +104,16 @@ class APIClient:
         return response.json()
     
     def get_analyzers(self) -> List[str]:
-        """Get list of available analyzers"""
-        response = self.session.get(f"{self.base_url}/api/analyzers", timeout=10)
-        if response.status_code == 200:
-            return response.json()
-        return []
+        """Get list of available analyzers (fetched once per client)"""
+        if self._analyzers_cache is None:
+            response = self.session.get(f"{self.base_url}/api/analyzers", timeout=10)
+            if response.status_code != 200:
+                return []
+            self._analyzers_cache = response.json()
+        return list(self._analyzers_cache)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def api_client():
     """Provide API client for tests"""
     client = APIClient()
@@ -81,10 +122,10 @@ def api_client():
     return client
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def available_analyzers(api_client):
-    """Get list of actually available analyzers"""
-    return api_client.get_analyzers()
+    """Set of actually available analyzers, for O(1) membership checks"""
+    return frozenset(api_client.get_analyzers())
 
 
 class TestAPIHealth:
@@ -178,7 +219,7 @@ class TestWorkflowExecution:
         
         # Verify all analyzers produced results
         analyzer_reports = result.get("analyzer_reports", [])
-        result_names = [r.get("name") for r in analyzer_reports]
+        result_names = {r.get("name") for r in analyzer_reports}
         
         for analyzer in analyzers_to_use:
             assert analyzer in result_names, f"{analyzer} missing from results"
@@ -192,23 +233,7 @@ class TestConditionalWorkflowExecution:
         if "ClamAV" not in available_analyzers:
             pytest.skip("ClamAV not available")
         
-        workflow = {
-            "nodes": [
-                {"id": "file-1", "type": "file", "data": {}, "position": {"x": 100, "y": 200}},
-                {"id": "analyzer-1", "type": "analyzer", "data": {"analyzer": "ClamAV"}, "position": {"x": 300, "y": 200}},
-                {"id": "cond-1", "type": "conditional", "data": {"conditionType": "verdict_malicious", "sourceAnalyzer": "ClamAV"}, "position": {"x": 500, "y": 200}},
-                {"id": "result-true", "type": "result", "data": {}, "position": {"x": 700, "y": 100}},
-                {"id": "result-false", "type": "result", "data": {}, "position": {"x": 700, "y": 300}}
-            ],
-            "edges": [
-                {"id": "e1", "source": "file-1", "target": "analyzer-1"},
-                {"id": "e2", "source": "analyzer-1", "target": "cond-1"},
-                {"id": "e3", "source": "cond-1", "target": "result-true", "sourceHandle": "true-output"},
-                {"id": "e4", "source": "cond-1", "target": "result-false", "sourceHandle": "false-output"}
-            ]
-        }
-        
-        result = api_client.execute_workflow(workflow, safe_sample_path)
+        result = api_client.execute_workflow(_COND_WF_JSON["clamav_verdict_malicious"], safe_sample_path)
         
         # For safe file, should route to FALSE branch
         stage_routing = result.get("stage_routing", [])
@@ -219,23 +244,7 @@ class TestConditionalWorkflowExecution:
         if "ClamAV" not in available_analyzers:
             pytest.skip("ClamAV not available")
         
-        workflow = {
-            "nodes": [
-                {"id": "file-1", "type": "file", "data": {}, "position": {"x": 100, "y": 200}},
-                {"id": "analyzer-1", "type": "analyzer", "data": {"analyzer": "ClamAV"}, "position": {"x": 300, "y": 200}},
-                {"id": "cond-1", "type": "conditional", "data": {"conditionType": "verdict_malicious", "sourceAnalyzer": "ClamAV"}, "position": {"x": 500, "y": 200}},
-                {"id": "result-true", "type": "result", "data": {}, "position": {"x": 700, "y": 100}},
-                {"id": "result-false", "type": "result", "data": {}, "position": {"x": 700, "y": 300}}
-            ],
-            "edges": [
-                {"id": "e1", "source": "file-1", "target": "analyzer-1"},
-                {"id": "e2", "source": "analyzer-1", "target": "cond-1"},
-                {"id": "e3", "source": "cond-1", "target": "result-true", "sourceHandle": "true-output"},
-                {"id": "e4", "source": "cond-1", "target": "result-false", "sourceHandle": "false-output"}
-            ]
-        }
-        
-        result = api_client.execute_workflow(workflow, malicious_sample_path)
+        result = api_client.execute_workflow(_COND_WF_JSON["clamav_verdict_malicious"], malicious_sample_path)
         
         # For EICAR file, should route to TRUE branch
         stage_routing = result.get("stage_routing", [])
@@ -247,23 +256,7 @@ class TestStageRoutingMetadata:
     
     def test_stage_routing_structure(self, api_client, safe_sample_path):
         """Verify stage_routing has correct structure"""
-        workflow = {
-            "nodes": [
-                {"id": "file-1", "type": "file", "data": {}, "position": {"x": 100, "y": 200}},
-                {"id": "analyzer-1", "type": "analyzer", "data": {"analyzer": "File_Info"}, "position": {"x": 300, "y": 200}},
-                {"id": "cond-1", "type": "conditional", "data": {"conditionType": "analyzer_success", "sourceAnalyzer": "File_Info"}, "position": {"x": 500, "y": 200}},
-                {"id": "result-1", "type": "result", "data": {}, "position": {"x": 700, "y": 100}},
-                {"id": "result-2", "type": "result", "data": {}, "position": {"x": 700, "y": 300}}
-            ],
-            "edges": [
-                {"id": "e1", "source": "file-1", "target": "analyzer-1"},
-                {"id": "e2", "source": "analyzer-1", "target": "cond-1"},
-                {"id": "e3", "source": "cond-1", "target": "result-1", "sourceHandle": "true-output"},
-                {"id": "e4", "source": "cond-1", "target": "result-2", "sourceHandle": "false-output"}
-            ]
-        }
-        
-        result = api_client.execute_workflow(workflow, safe_sample_path)
+        result = api_client.execute_workflow(_COND_WF_JSON["file_info_analyzer_success"], safe_sample_path)
         
         stage_routing = result.get("stage_routing", [])
         
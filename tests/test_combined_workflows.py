@@ -3,8 +3,34 @@ Test Section 3: Complex Combined Workflows
 Tests multi-branch, diamond patterns, and complex routing
 """
 
+import logging
+
 import pytest
-from conftest import WorkflowBuilder, WorkflowTester
+from conftest import WorkflowTester
+
+logger = logging.getLogger(__name__)
+
+# Keep this module on one xdist worker (--dist loadgroup) so its runs don't
+# contend for the same ClamAV daemon
+pytestmark = pytest.mark.xdist_group("workflow_exec")
+
+
+# File → ClamAV → [verdict_malicious] → Malicious / Clean result
+_CLAMAV_ROUTING_DAG = {
+    "nodes": {
+        "file": {"type": "file"},
+        "clamav": {"type": "analyzer", "analyzer": "ClamAV", "x": 200},
+        "cond": {"type": "conditional", "condition_type": "verdict_malicious", "source_analyzer": "ClamAV", "x": 400},
+        "malicious": {"type": "result", "x": 600, "y": 100, "label": "Malicious Result"},
+        "clean": {"type": "result", "x": 600, "y": 300, "label": "Clean Result"},
+    },
+    "edges": [
+        ("file", "clamav"),
+        ("clamav", "cond"),
+        ("cond", "malicious", "true-output"),
+        ("cond", "clean", "false-output"),
+    ],
+}
 
 
 class TestDiamondPattern:
@@ -38,13 +64,10 @@ class TestDiamondPattern:
         
         assert result.success, f"Workflow failed: {result.error}"
         
-        reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
-        
         # All three analyzers should be in the result
-        assert 'File_Info' in analyzer_names, f"File_Info missing from {analyzer_names}"
-        assert 'ClamAV' in analyzer_names, f"ClamAV missing from {analyzer_names}"
-        assert 'Strings_Info' in analyzer_names, f"Strings_Info missing from {analyzer_names}"
+        assert 'File_Info' in result.analyzer_names, f"File_Info missing from {sorted(result.analyzer_names)}"
+        assert 'ClamAV' in result.analyzer_names, f"ClamAV missing from {sorted(result.analyzer_names)}"
+        assert 'Strings_Info' in result.analyzer_names, f"Strings_Info missing from {sorted(result.analyzer_names)}"
 
 
 class TestMultiResultDistribution:
@@ -126,15 +149,12 @@ class TestConditionalWithParallel:
         
         assert result.success, f"Workflow failed: {result.error}"
         
-        reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
-        
         # File_Info and ClamAV always run
-        assert 'File_Info' in analyzer_names
-        assert 'ClamAV' in analyzer_names
+        assert 'File_Info' in result.analyzer_names
+        assert 'ClamAV' in result.analyzer_names
         
         # For malicious file, Strings_Info should run (TRUE branch)
-        assert 'Strings_Info' in analyzer_names, f"TRUE branch should execute for malicious file"
+        assert 'Strings_Info' in result.analyzer_names, f"TRUE branch should execute for malicious file"
 
 
 class TestConditionalsWithSharedAnalyzers:
@@ -178,13 +198,10 @@ class TestConditionalsWithSharedAnalyzers:
         
         assert result.success, f"Workflow failed: {result.error}"
         
-        reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
-        
         # ClamAV always runs
-        assert 'ClamAV' in analyzer_names
+        assert 'ClamAV' in result.analyzer_names
         # File_Info should run (either branch)
-        assert 'File_Info' in analyzer_names
+        assert 'File_Info' in result.analyzer_names
 
 
 class TestComplexMultiStage:
@@ -236,12 +253,9 @@ class TestComplexMultiStage:
         assert result.success, f"Workflow failed: {result.error}"
         
         # Verify execution path
-        reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
-        
-        assert 'File_Info' in analyzer_names
+        assert 'File_Info' in result.analyzer_names
         # File_Info should succeed → ClamAV runs
-        assert 'ClamAV' in analyzer_names
+        assert 'ClamAV' in result.analyzer_names
         # For safe file, verdict_malicious is FALSE → Result2
 
 
@@ -305,11 +319,8 @@ class TestEdgeCases:
         
         assert result.success, f"Workflow failed: {result.error}"
         
-        reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
-        
         # ClamAV should always run
-        assert 'ClamAV' in analyzer_names
+        assert 'ClamAV' in result.analyzer_names
 
 
 class TestResultNodeDistribution:
@@ -317,59 +328,26 @@ class TestResultNodeDistribution:
     Test that results are correctly distributed to multiple result nodes
     """
     
-    def test_conditional_routes_to_correct_result(self, workflow_tester, workflow_builder, safe_sample_path, malicious_sample_path):
+    def test_conditional_routes_to_correct_result(self, workflow_tester, dag_factory, safe_sample_path, malicious_sample_path):
         """
         Verify the correct result node receives results based on condition
         """
-        # Test with safe file
-        file_id = workflow_builder.add_file_node()
-        clamav_id = workflow_builder.add_analyzer_node("ClamAV", x=200)
-        conditional_id = workflow_builder.add_conditional_node(
-            condition_type="verdict_malicious",
-            source_analyzer="ClamAV",
-            x=400
-        )
-        result_true_id = workflow_builder.add_result_node(x=600, y=100, label="Malicious Result")
-        result_false_id = workflow_builder.add_result_node(x=600, y=300, label="Clean Result")
+        nodes, edges, _ = dag_factory(_CLAMAV_ROUTING_DAG)
         
-        workflow_builder.connect(file_id, clamav_id)
-        workflow_builder.connect(clamav_id, conditional_id)
-        workflow_builder.connect(conditional_id, result_true_id, source_handle="true-output")
-        workflow_builder.connect(conditional_id, result_false_id, source_handle="false-output")
+        # Submit both runs concurrently over the shared keep-alive session
+        result_safe, result_mal = workflow_tester.execute_workflows([
+            (nodes, edges, safe_sample_path),
+            (nodes, edges, malicious_sample_path)
+        ])
         
-        nodes, edges = workflow_builder.get_workflow()
-        
-        # Execute with safe file
-        result_safe = workflow_tester.execute_workflow(nodes, edges, safe_sample_path)
         assert result_safe.success, f"Workflow failed with safe file: {result_safe.error}"
         
         # Check which result node received results
-        print(f"Safe file - Stage routing: {result_safe.stage_routing}")
-        
-        # Reset and test with malicious file
-        workflow_builder = WorkflowBuilder()
-        file_id = workflow_builder.add_file_node()
-        clamav_id = workflow_builder.add_analyzer_node("ClamAV", x=200)
-        conditional_id = workflow_builder.add_conditional_node(
-            condition_type="verdict_malicious",
-            source_analyzer="ClamAV",
-            x=400
-        )
-        result_true_id = workflow_builder.add_result_node(x=600, y=100, label="Malicious Result")
-        result_false_id = workflow_builder.add_result_node(x=600, y=300, label="Clean Result")
-        
-        workflow_builder.connect(file_id, clamav_id)
-        workflow_builder.connect(clamav_id, conditional_id)
-        workflow_builder.connect(conditional_id, result_true_id, source_handle="true-output")
-        workflow_builder.connect(conditional_id, result_false_id, source_handle="false-output")
-        
-        nodes, edges = workflow_builder.get_workflow()
+        logger.debug("Safe file - Stage routing: %s", result_safe.stage_routing)
         
-        # Execute with malicious file
-        result_mal = workflow_tester.execute_workflow(nodes, edges, malicious_sample_path)
         assert result_mal.success, f"Workflow failed with malicious file: {result_mal.error}"
         
-        print(f"Malicious file - Stage routing: {result_mal.stage_routing}")
+        logger.debug("Malicious file - Stage routing: %s", result_mal.stage_routing)
 
 
 if __name__ == "__main__":
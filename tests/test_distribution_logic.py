@@ -5,11 +5,19 @@ Unit tests for the tree-based distribution functions in useWorkflowExecution.ts
 
 import pytest
 import json
-from typing import Dict, List, Any
+import sys
+from collections import defaultdict, deque
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+# Shared child list for nodes without outgoing edges
+_EMPTY: Tuple[str, ...] = ()
 
 
 class MockNode:
     """Mock representation of a React Flow node"""
+    __slots__ = ('id', 'type', 'data', 'position')
+    
     def __init__(self, id: str, node_type: str, data: Dict = None, position: Dict = None):
         self.id = id
         self.type = node_type
@@ -27,6 +35,8 @@ class MockNode:
 
 class MockEdge:
     """Mock representation of a React Flow edge"""
+    __slots__ = ('id', 'source', 'target', 'sourceHandle', 'targetHandle')
+    
     def __init__(self, source: str, target: str, source_handle: str = None, target_handle: str = None):
         self.id = f"{source}-{target}"
         self.source = source
@@ -58,45 +68,58 @@ class TreeBasedDistributionSimulator:
     def __init__(self, nodes: List[MockNode], edges: List[MockEdge]):
         self.nodes = {n.id: n for n in nodes}
         self.edges = edges
+        
+        # Adjacency and type indexes, built once so lookups don't rescan edges/nodes
+        self.children: Dict[str, List[str]] = {}
+        for e in edges:
+            self.children.setdefault(e.source, []).append(e.target)
+        self.nodes_by_type: Dict[str, List[str]] = {}
+        for nid, n in self.nodes.items():
+            self.nodes_by_type.setdefault(n.type, []).append(nid)
+        
+        # Analyzer names are a small closed vocabulary; interning them (and report
+        # names on ingress) lets set/dict lookups match on identity
+        self.analyzer_name: Dict[str, str] = {
+            nid: sys.intern(n.data.get('analyzer', n.data.get('name', 'Unknown')))
+            for nid, n in self.nodes.items() if n.type == 'analyzer'
+        }
+        self._leaf_index: Dict[str, Dict[str, FrozenSet[str]]] = {}
     
     def find_root_node(self) -> str:
         """Find the File node (root of tree)"""
-        for nid, n in self.nodes.items():
-            if n.type == 'file':
-                return nid
-        return None
+        files = self.nodes_by_type.get('file')
+        return files[0] if files else None
     
     def find_leaf_nodes(self) -> List[str]:
         """Find all Result nodes (leaves in tree)"""
-        return [nid for nid, n in self.nodes.items() if n.type == 'result']
+        return list(self.nodes_by_type.get('result', ()))
     
     def find_analyzer_nodes(self) -> List[str]:
         """Find all analyzer nodes"""
-        return [nid for nid, n in self.nodes.items() if n.type == 'analyzer']
+        return list(self.nodes_by_type.get('analyzer', ()))
     
-    def get_children(self, node_id: str) -> List[str]:
+    def get_children(self, node_id: str) -> Sequence[str]:
         """Get all child nodes (outgoing edges)"""
-        children = []
-        for edge in self.edges:
-            if edge.source == node_id:
-                children.append(edge.target)
-        return children
+        return self.children.get(node_id, _EMPTY)
     
     def has_path_between_nodes(self, start_id: str, target_id: str) -> bool:
-        """Check if there's any path between two nodes using BFS"""
-        visited = set()
-        queue = [start_id]
+        """
+        Check if there's any path between two nodes using BFS.
+        The distribution strategies get reachability from their own DFS;
+        this stays for standalone reachability checks.
+        """
+        visited = {start_id}
+        queue = deque([start_id])
         
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             if current == target_id:
                 return True
-            if current in visited:
-                continue
-            visited.add(current)
             
-            children = self.get_children(current)
-            queue.extend(children)
+            for child in self.get_children(current):
+                if child not in visited:
+                    visited.add(child)
+                    queue.append(child)
         
         return False
     
@@ -107,59 +130,206 @@ class TreeBasedDistributionSimulator:
         
         Algorithm:
         1. Start at File node (root)
-        2. Recursively explore child nodes (outgoing edges)
+        2. Explore child nodes (outgoing edges) with an explicit stack
         3. Collect Analyzer nodes encountered
         4. Stop when reaching target Result node (leaf)
         5. Backtrack to explore other branches
         6. Return unique analyzers from all paths found
         """
-        all_paths = []
-        visited = set()
-        
-        def dfs_traversal(current_id: str, current_path: List[str]):
-            if current_id in visited:
+        nodes = self.nodes
+        analyzer_name = self.analyzer_name
+        unique_analyzers = set()
+        analyzer_stack: List[str] = []  # analyzers on the current root→node path
+        flushed = 0  # length of the analyzer_stack prefix already in unique_analyzers
+        on_path = set()
+        # Frames: (node_id, whether the node pushed an analyzer, pending children)
+        stack: List[Tuple[str, bool, Iterator[str]]] = []
+        
+        def visit(current_id: str):
+            nonlocal flushed
+            if current_id in on_path:
                 return
             
-            node = self.nodes.get(current_id)
-            if not node:
+            if current_id not in nodes:
                 return
             
-            # Collect analyzer if current node is Analyzer type
-            path_with_current = list(current_path)
-            if node.type == 'analyzer':
-                analyzer_name = node.data.get('analyzer', node.data.get('name', 'Unknown'))
-                path_with_current.append(analyzer_name)
+            name = analyzer_name.get(current_id)
+            is_analyzer = name is not None
             
             # BASE CASE: Reached target leaf node
             if current_id == target_leaf_id:
-                all_paths.append(path_with_current)
+                unique_analyzers.update(analyzer_stack[flushed:])
+                flushed = len(analyzer_stack)
+                if is_analyzer:
+                    unique_analyzers.add(name)
                 return
             
-            # Mark as visited for this path
-            visited.add(current_id)
+            # Collect analyzer if current node is Analyzer type
+            if is_analyzer:
+                analyzer_stack.append(name)
             
-            # RECURSIVE CASE: Explore all child nodes
-            children = self.get_children(current_id)
+            # Mark as visited for this path and explore children
+            on_path.add(current_id)
+            stack.append((current_id, is_analyzer, iter(self.get_children(current_id))))
+        
+        visit(root_id)
+        while stack:
+            current_id, pushed, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                # Backtrack
+                stack.pop()
+                on_path.discard(current_id)
+                if pushed:
+                    analyzer_stack.pop()
+                    flushed = min(flushed, len(analyzer_stack))
+            else:
+                visit(child)
+        
+        return list(unique_analyzers)
+    
+    def compute_leaf_analyzers(self, root_id: str) -> Dict[str, FrozenSet[str]]:
+        """
+        Collect, for every Result leaf reachable from root, the analyzers on
+        any root→leaf path.
+        
+        Equivalent to calling find_analyzers_in_tree_path once per leaf, but
+        computed once per root and cached (the simulator's graph is fixed).
+        
+        Returns:
+            Dict mapping each reached leaf id to its analyzer names
+        """
+        cached = self._leaf_index.get(root_id)
+        if cached is None:
+            if root_id not in self.nodes:
+                return {}
+            
+            leaf_sets = self._leaf_analyzers_acyclic(root_id)
+            if leaf_sets is None:
+                leaf_sets = self._leaf_analyzers_by_paths(root_id)
+            cached = self._leaf_index[root_id] = leaf_sets
+        return dict(cached)
+    
+    def _leaf_analyzers_acyclic(self, root_id: str) -> Optional[Dict[str, FrozenSet[str]]]:
+        """
+        Post-order pass memoizing, per node, the analyzers between it and each
+        leaf below it, so merge points (diamonds) are expanded only once.
+        
+        Returns:
+            Leaf id -> analyzers, or None if a cycle is reachable from root
+        """
+        nodes = self.nodes
+        analyzer_name = self.analyzer_name
+        # Per node: leaf id -> analyzers on node→leaf paths (node included)
+        below: Dict[str, Dict[str, FrozenSet[str]]] = {}
+        on_stack = {root_id}
+        stack: List[Tuple[str, Iterator[str]]] = [(root_id, iter(self.get_children(root_id)))]
+        while stack:
+            current_id, children = stack[-1]
             for child in children:
-                dfs_traversal(child, path_with_current)
+                if child in on_stack:
+                    return None
+                if child not in below and child in nodes:
+                    on_stack.add(child)
+                    stack.append((child, iter(self.get_children(child))))
+                    break
+            else:
+                stack.pop()
+                on_stack.discard(current_id)
+                
+                merged: Dict[str, FrozenSet[str]] = {}
+                for child in self.get_children(current_id):
+                    for leaf_id, analyzers in below.get(child, {}).items():
+                        seen = merged.get(leaf_id)
+                        merged[leaf_id] = analyzers if seen is None else seen | analyzers
+                
+                name = analyzer_name.get(current_id)
+                if name is not None:
+                    own = frozenset((name,))
+                    merged = {leaf_id: analyzers | own for leaf_id, analyzers in merged.items()}
+                elif nodes[current_id].type == 'result':
+                    merged[current_id] = frozenset()
+                below[current_id] = merged
+        
+        return below[root_id]
+    
+    def _leaf_analyzers_by_paths(self, root_id: str) -> Dict[str, FrozenSet[str]]:
+        """
+        Enumerate simple root→leaf paths with one explicit-stack DFS.
+        Used for cyclic graphs, where per-node memoization is not valid.
+        """
+        nodes = self.nodes
+        analyzer_name = self.analyzer_name
+        leaf_sets: Dict[str, Set[str]] = {}
+        analyzer_stack: List[str] = []
+        on_path = set()
+        stack: List[Tuple[str, bool, Iterator[str]]] = []
+        
+        def visit(current_id: str):
+            if current_id in on_path or current_id not in nodes:
+                return
             
-            # Backtrack
-            visited.discard(current_id)
+            if nodes[current_id].type == 'result':
+                leaf_sets.setdefault(current_id, set()).update(analyzer_stack)
+            
+            children = self.get_children(current_id)
+            if not children:
+                # Childless: nothing below to carry state to, so no frame
+                return
+            
+            name = analyzer_name.get(current_id)
+            pushed = name is not None
+            if pushed:
+                analyzer_stack.append(name)
+            
+            on_path.add(current_id)
+            stack.append((current_id, pushed, iter(children)))
+        
+        visit(root_id)
+        while stack:
+            current_id, pushed, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                on_path.discard(current_id)
+                if pushed:
+                    analyzer_stack.pop()
+            else:
+                visit(child)
         
-        dfs_traversal(root_id, [])
+        return {leaf_id: frozenset(analyzers) for leaf_id, analyzers in leaf_sets.items()}
+    
+    @staticmethod
+    def _scatter_reports(reports: List[Dict], analyzer_sets: Iterable[FrozenSet[str]]) -> Dict[FrozenSet[str], List[Dict]]:
+        """
+        Route reports to every analyzer set that needs them in one pass.
         
-        # Aggregate unique analyzers from all paths
-        unique_analyzers = set()
-        for path in all_paths:
-            for analyzer in path:
-                unique_analyzers.add(analyzer)
+        Leaves with the same analyzer set share one bucket (callers copy it
+        per leaf), and each list keeps the original report order.
         
-        return list(unique_analyzers)
+        Returns:
+            Dict mapping each analyzer set to its matching reports
+        """
+        filtered_by_set: Dict[FrozenSet[str], List[Dict]] = {}
+        buckets_by_name: Dict[str, List[List[Dict]]] = defaultdict(list)
+        for analyzers in analyzer_sets:
+            if analyzers not in filtered_by_set:
+                bucket = filtered_by_set[analyzers] = []
+                for name in analyzers:
+                    buckets_by_name[name].append(bucket)
+        
+        for report in reports:
+            name = report.get('name')
+            if type(name) is str:
+                name = sys.intern(name)
+            for bucket in buckets_by_name.get(name, ()):
+                bucket.append(report)
+        return filtered_by_set
     
     def distribute_using_tree_traversal(self, all_results: Dict) -> Dict[str, Dict]:
         """
         Simulate distributeUsingTreeTraversal from useWorkflowExecution.ts
-        Fallback strategy using DFS from root to each leaf
+        Fallback strategy using one DFS from root covering every leaf
         """
         root_id = self.find_root_node()
         leaf_ids = self.find_leaf_nodes()
@@ -168,36 +338,32 @@ class TreeBasedDistributionSimulator:
             return {}
         
         all_analyzer_reports = all_results.get('analyzer_reports', [])
+        leaf_analyzers = self.compute_leaf_analyzers(root_id)
+        filtered_by_set = self._scatter_reports(all_analyzer_reports, leaf_analyzers.values())
         leaf_results = {}
         
         for leaf_id in leaf_ids:
-            path_analyzers = self.find_analyzers_in_tree_path(root_id, leaf_id)
+            # Leaves reached by the DFS are exactly the ones with a path from root
+            path_analyzers = leaf_analyzers.get(leaf_id)
             
-            if len(path_analyzers) == 0:
-                # Check if there's any path at all
-                has_path = self.has_path_between_nodes(root_id, leaf_id)
-                
-                if has_path:
-                    # Path exists but no analyzers
-                    leaf_results[leaf_id] = {
-                        'job_id': all_results.get('job_id'),
-                        'status': all_results.get('status'),
-                        'analyzer_reports': []
-                    }
-                else:
-                    # No path at all
-                    leaf_results[leaf_id] = {
-                        'job_id': None,
-                        'status': 'idle',
-                        'analyzer_reports': [],
-                        'error': 'No path from File node (root) to this Result node (leaf)'
-                    }
+            if path_analyzers is None:
+                # No path at all
+                leaf_results[leaf_id] = {
+                    'job_id': None,
+                    'status': 'idle',
+                    'analyzer_reports': [],
+                    'error': 'No path from File node (root) to this Result node (leaf)'
+                }
+            elif len(path_analyzers) == 0:
+                # Path exists but no analyzers
+                leaf_results[leaf_id] = {
+                    'job_id': all_results.get('job_id'),
+                    'status': all_results.get('status'),
+                    'analyzer_reports': []
+                }
             else:
                 # Filter reports for analyzers in this path
-                filtered_reports = [
-                    report for report in all_analyzer_reports
-                    if report.get('name') in path_analyzers
-                ]
+                filtered_reports = list(filtered_by_set[path_analyzers])
                 
                 leaf_results[leaf_id] = {
                     'job_id': all_results.get('job_id'),
@@ -214,50 +380,54 @@ class TreeBasedDistributionSimulator:
         """
         leaf_ids = self.find_leaf_nodes()
         
-        # Aggregate all analyzer reports
-        all_analyzer_reports = []
-        if all_results.get('analyzer_reports'):
-            all_analyzer_reports = all_results['analyzer_reports']
-        else:
-            for key in all_results:
-                if isinstance(all_results[key], dict) and 'analyzer_reports' in all_results[key]:
-                    all_analyzer_reports.extend(all_results[key]['analyzer_reports'])
-        
-        # Build leaf node map
-        leaf_node_map = {
-            leaf_id: {
-                'analyzers': [],
-                'executed': False,
-                'error': 'Path not executed (condition not met or branch not taken)'
-            }
-            for leaf_id in leaf_ids
-        }
-        
-        # Process stage routing
+        # Aggregate all analyzer reports; top-level reports are the common case,
+        # per-stage dicts are only scanned when they're missing
+        all_analyzer_reports = all_results.get('analyzer_reports')
+        if not all_analyzer_reports:
+            all_analyzer_reports = []
+            for value in all_results.values():
+                if isinstance(value, dict):
+                    stage_reports = value.get('analyzer_reports')
+                    if stage_reports:
+                        all_analyzer_reports.extend(stage_reports)
+        
+        # Bucket executed stages by target node once; stages that didn't run
+        # contribute nothing, so they are dropped here
+        stage_analyzers_by_target: Dict[str, List[List[str]]] = defaultdict(list)
         for routing in stage_routing:
-            executed = routing.get('executed', False)
+            if not routing.get('executed', False):
+                continue
             analyzers = routing.get('analyzers', [])
-            target_nodes = routing.get('target_nodes', [])
-            
-            for leaf_id in target_nodes:
-                if leaf_id not in leaf_node_map:
-                    continue
-                
-                leaf_info = leaf_node_map[leaf_id]
-                
-                if executed:
-                    leaf_info['executed'] = True
-                    leaf_info['analyzers'] = list(set(leaf_info['analyzers'] + analyzers))
-                    leaf_info['error'] = None
+            for target_id in routing.get('target_nodes', []):
+                stage_analyzers_by_target[target_id].append(analyzers)
+        
+        # Build leaf node map
+        leaf_node_map = {}
+        for leaf_id in leaf_ids:
+            stages = stage_analyzers_by_target.get(leaf_id)
+            if stages:
+                leaf_node_map[leaf_id] = {
+                    'analyzers': set().union(*stages),
+                    'executed': True,
+                    'error': None
+                }
+            else:
+                leaf_node_map[leaf_id] = {
+                    'analyzers': set(),
+                    'executed': False,
+                    'error': 'Path not executed (condition not met or branch not taken)'
+                }
         
         # Build results
+        executed_sets = {
+            leaf_id: frozenset(info['analyzers'])
+            for leaf_id, info in leaf_node_map.items() if info['executed']
+        }
+        filtered_by_set = self._scatter_reports(all_analyzer_reports, executed_sets.values())
         leaf_results = {}
         for leaf_id, info in leaf_node_map.items():
             if info['executed']:
-                filtered_reports = [
-                    r for r in all_analyzer_reports
-                    if r.get('name') in info['analyzers']
-                ]
+                filtered_reports = list(filtered_by_set[executed_sets[leaf_id]])
                 leaf_results[leaf_id] = {
                     'job_id': all_results.get('job_id'),
                     'status': all_results.get('status'),
@@ -396,6 +566,101 @@ class TestTreeTraversal:
         result2_names = [r["name"] for r in distribution["result-2"]["analyzer_reports"]]
         assert "File_Info" in result2_names
 
+    
+    def test_single_pass_matches_per_leaf_dfs(self):
+        """
+        File → ClamAV → Result1
+             → File_Info → Result2
+                         → Strings → Result1
+        """
+        nodes = [
+            MockNode("file-1", "file"),
+            MockNode("analyzer-1", "analyzer", {"analyzer": "ClamAV"}),
+            MockNode("analyzer-2", "analyzer", {"analyzer": "File_Info"}),
+            MockNode("analyzer-3", "analyzer", {"analyzer": "Strings_Info"}),
+            MockNode("result-1", "result"),
+            MockNode("result-2", "result")
+        ]
+        edges = [
+            MockEdge("file-1", "analyzer-1"),
+            MockEdge("analyzer-1", "result-1"),
+            MockEdge("file-1", "analyzer-2"),
+            MockEdge("analyzer-2", "result-2"),
+            MockEdge("analyzer-2", "analyzer-3"),
+            MockEdge("analyzer-3", "result-1")
+        ]
+        
+        simulator = TreeBasedDistributionSimulator(nodes, edges)
+        leaf_analyzers = simulator.compute_leaf_analyzers("file-1")
+        
+        for leaf_id in simulator.find_leaf_nodes():
+            expected = set(simulator.find_analyzers_in_tree_path("file-1", leaf_id))
+            assert leaf_analyzers[leaf_id] == expected
+        
+        assert leaf_analyzers["result-1"] == {"ClamAV", "File_Info", "Strings_Info"}
+        assert leaf_analyzers["result-2"] == {"File_Info"}
+    
+    def test_diamond_merge_point(self):
+        """
+        File → ClamAV → Strings → Result1
+             → File_Info ↗       → Result2 (cycle-free diamond)
+        """
+        nodes = [
+            MockNode("file-1", "file"),
+            MockNode("analyzer-1", "analyzer", {"analyzer": "ClamAV"}),
+            MockNode("analyzer-2", "analyzer", {"analyzer": "File_Info"}),
+            MockNode("analyzer-3", "analyzer", {"analyzer": "Strings_Info"}),
+            MockNode("result-1", "result"),
+            MockNode("result-2", "result")
+        ]
+        edges = [
+            MockEdge("file-1", "analyzer-1"),
+            MockEdge("file-1", "analyzer-2"),
+            MockEdge("analyzer-1", "analyzer-3"),
+            MockEdge("analyzer-2", "analyzer-3"),
+            MockEdge("analyzer-3", "result-1"),
+            MockEdge("analyzer-2", "result-2")
+        ]
+        
+        simulator = TreeBasedDistributionSimulator(nodes, edges)
+        leaf_analyzers = simulator.compute_leaf_analyzers("file-1")
+        
+        assert leaf_analyzers["result-1"] == {"ClamAV", "File_Info", "Strings_Info"}
+        assert leaf_analyzers["result-2"] == {"File_Info"}
+    
+    def test_cycle_falls_back_to_path_enumeration(self):
+        """
+        File → ClamAV → File_Info → Strings → Result2
+                        File_Info → Result1
+                        Strings → ClamAV (back edge closing a cycle)
+        """
+        nodes = [
+            MockNode("file-1", "file"),
+            MockNode("analyzer-1", "analyzer", {"analyzer": "ClamAV"}),
+            MockNode("analyzer-2", "analyzer", {"analyzer": "File_Info"}),
+            MockNode("analyzer-3", "analyzer", {"analyzer": "Strings_Info"}),
+            MockNode("result-1", "result"),
+            MockNode("result-2", "result")
+        ]
+        edges = [
+            MockEdge("file-1", "analyzer-1"),
+            MockEdge("analyzer-1", "analyzer-2"),
+            MockEdge("analyzer-2", "analyzer-3"),
+            MockEdge("analyzer-3", "analyzer-1"),
+            MockEdge("analyzer-2", "result-1"),
+            MockEdge("analyzer-3", "result-2")
+        ]
+        
+        simulator = TreeBasedDistributionSimulator(nodes, edges)
+        leaf_analyzers = simulator.compute_leaf_analyzers("file-1")
+        
+        for leaf_id in simulator.find_leaf_nodes():
+            expected = set(simulator.find_analyzers_in_tree_path("file-1", leaf_id))
+            assert leaf_analyzers[leaf_id] == expected
+        
+        assert leaf_analyzers["result-1"] == {"ClamAV", "File_Info"}
+        assert leaf_analyzers["result-2"] == {"ClamAV", "File_Info", "Strings_Info"}
+
 
 class TestBackendRoutingDistribution:
     """Test the backend routing distribution logic"""
@@ -557,6 +822,36 @@ class TestEdgeCases:
         reports = distribution["result-1"]["analyzer_reports"]
         assert len(reports) == 2
     
+    def test_leaves_with_same_analyzers_get_own_report_lists(self):
+        """Mutating one leaf's reports must not change another leaf's"""
+        nodes = [
+            MockNode("file-1", "file"),
+            MockNode("analyzer-1", "analyzer", {"analyzer": "ClamAV"}),
+            MockNode("result-1", "result"),
+            MockNode("result-2", "result")
+        ]
+        edges = [
+            MockEdge("file-1", "analyzer-1"),
+            MockEdge("analyzer-1", "result-1"),
+            MockEdge("analyzer-1", "result-2")
+        ]
+        
+        simulator = TreeBasedDistributionSimulator(nodes, edges)
+        
+        mock_results = {
+            "job_id": "123",
+            "status": "completed",
+            "analyzer_reports": [{"name": "ClamAV", "status": "success", "report": {}}]
+        }
+        stage_routing = [{"stage_id": 0, "executed": True, "analyzers": ["ClamAV"], "target_nodes": ["result-1", "result-2"]}]
+        
+        for distribution in (
+            simulator.distribute_using_tree_traversal(mock_results),
+            simulator.distribute_using_backend_routing(mock_results, stage_routing)
+        ):
+            distribution["result-1"]["analyzer_reports"].clear()
+            assert len(distribution["result-2"]["analyzer_reports"]) == 1
+    
     def test_deep_tree_five_analyzers(self):
         """
         Test 4: Deep Nested Tree
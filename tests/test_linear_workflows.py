@@ -4,87 +4,34 @@ Tests basic workflows without conditional logic
 """
 
 import pytest
+from typing import Dict, List, Tuple
+
 from conftest import WorkflowBuilder, WorkflowTester
 
 
+def build_linear(workflow_builder: WorkflowBuilder, analyzers: List[str]) -> Tuple[List[Dict], List[Dict]]:
+    """Build File → analyzers (in order) → Result and return (nodes, edges)"""
+    ids = [workflow_builder.add_file_node()]
+    ids += [workflow_builder.add_analyzer_node(name, x=300 + 200 * i) for i, name in enumerate(analyzers)]
+    ids.append(workflow_builder.add_result_node(x=300 + 200 * len(analyzers)))
+    workflow_builder.connect_chain(*ids)
+    return workflow_builder.get_workflow()
+
+
 class TestLinearSingleAnalyzer:
     """Test workflows with a single analyzer"""
     
-    def test_file_info_analyzer(self, workflow_tester, workflow_builder, safe_sample_path):
-        """
-        Workflow: File → File_Info → Result
-        Expected: Result shows File_Info report
-        """
-        # Build workflow
-        file_id = workflow_builder.add_file_node()
-        analyzer_id = workflow_builder.add_analyzer_node("File_Info", x=300)
-        result_id = workflow_builder.add_result_node(x=500)
-        
-        workflow_builder.connect(file_id, analyzer_id)
-        workflow_builder.connect(analyzer_id, result_id)
-        
-        nodes, edges = workflow_builder.get_workflow()
-        
-        # Execute
-        result = workflow_tester.execute_workflow(nodes, edges, safe_sample_path)
-        
-        # Assertions
-        assert result.success, f"Workflow failed: {result.error}"
-        assert result.job_id is not None
-        assert result.has_conditionals is False
-        assert result.results is not None
-        
-        # Check analyzer_reports
-        reports = result.results.get('analyzer_reports', [])
-        assert len(reports) >= 1, "Expected at least 1 analyzer report"
-        
-        analyzer_names = [r['name'] for r in reports]
-        assert 'File_Info' in analyzer_names, f"Expected File_Info in {analyzer_names}"
-    
-    def test_clamav_safe_file(self, workflow_tester, workflow_builder, safe_sample_path):
-        """
-        Workflow: File → ClamAV → Result
-        Expected: Result shows ClamAV report with no detections
-        """
-        file_id = workflow_builder.add_file_node()
-        analyzer_id = workflow_builder.add_analyzer_node("ClamAV", x=300)
-        result_id = workflow_builder.add_result_node(x=500)
-        
-        workflow_builder.connect(file_id, analyzer_id)
-        workflow_builder.connect(analyzer_id, result_id)
-        
-        nodes, edges = workflow_builder.get_workflow()
-        result = workflow_tester.execute_workflow(nodes, edges, safe_sample_path)
-        
-        assert result.success, f"Workflow failed: {result.error}"
-        
-        reports = result.results.get('analyzer_reports', [])
-        clamav_report = next((r for r in reports if r['name'] == 'ClamAV'), None)
-        assert clamav_report is not None, "ClamAV report not found"
-        
-        # For safe file, detections should be empty
-        detections = clamav_report.get('report', {}).get('detections', [])
-        assert len(detections) == 0, f"Expected no detections for safe file, got: {detections}"
-    
     def test_clamav_malicious_file(self, workflow_tester, workflow_builder, malicious_sample_path):
         """
         Workflow: File → ClamAV → Result
         Expected: Result shows ClamAV report with EICAR detection
         """
-        file_id = workflow_builder.add_file_node()
-        analyzer_id = workflow_builder.add_analyzer_node("ClamAV", x=300)
-        result_id = workflow_builder.add_result_node(x=500)
-        
-        workflow_builder.connect(file_id, analyzer_id)
-        workflow_builder.connect(analyzer_id, result_id)
-        
-        nodes, edges = workflow_builder.get_workflow()
+        nodes, edges = build_linear(workflow_builder, ["ClamAV"])
         result = workflow_tester.execute_workflow(nodes, edges, malicious_sample_path)
         
         assert result.success, f"Workflow failed: {result.error}"
         
-        reports = result.results.get('analyzer_reports', [])
-        clamav_report = next((r for r in reports if r['name'] == 'ClamAV'), None)
+        clamav_report = result.analyzer_reports.get('ClamAV')
         assert clamav_report is not None, "ClamAV report not found"
         
         # For EICAR, should have detection
@@ -92,64 +39,41 @@ class TestLinearSingleAnalyzer:
         assert len(detections) > 0, f"Expected EICAR detection, got: {detections}"
 
 
-class TestLinearMultipleAnalyzers:
-    """Test workflows with multiple analyzers in sequence"""
+class TestLinearAnalyzerChains:
+    """Test File → analyzer chain → Result workflows on the safe sample"""
     
-    def test_two_analyzers_sequential(self, workflow_tester, workflow_builder, safe_sample_path):
-        """
-        Workflow: File → File_Info → ClamAV → Result
-        Expected: Result shows BOTH File_Info AND ClamAV reports
-        """
-        file_id = workflow_builder.add_file_node()
-        analyzer1_id = workflow_builder.add_analyzer_node("File_Info", x=300)
-        analyzer2_id = workflow_builder.add_analyzer_node("ClamAV", x=500)
-        result_id = workflow_builder.add_result_node(x=700)
-        
-        workflow_builder.connect(file_id, analyzer1_id)
-        workflow_builder.connect(analyzer1_id, analyzer2_id)
-        workflow_builder.connect(analyzer2_id, result_id)
-        
-        nodes, edges = workflow_builder.get_workflow()
+    @pytest.mark.parametrize("analyzers", [
+        pytest.param(["File_Info"], id="file_info"),
+        pytest.param(["ClamAV"], id="clamav"),
+        pytest.param(["File_Info", "ClamAV"], id="file_info-clamav"),
+        pytest.param(["File_Info", "ClamAV", "Strings_Info"], id="file_info-clamav-strings"),
+    ])
+    def test_linear_chain(self, analyzers, workflow_tester, workflow_builder, safe_sample_path):
+        """
+        Workflow: File → analyzers[0] → ... → analyzers[-1] → Result
+        Expected: Result shows a report for every analyzer in the chain,
+        and ClamAV (when in the chain) reports no detections
+        """
+        nodes, edges = build_linear(workflow_builder, analyzers)
         result = workflow_tester.execute_workflow(nodes, edges, safe_sample_path)
         
         assert result.success, f"Workflow failed: {result.error}"
+        assert result.job_id is not None
+        assert result.has_conditionals is False
+        assert result.results is not None
         
         reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
+        analyzer_names = result.analyzer_names
         
-        # CRITICAL: Both analyzers should be in results
-        assert 'File_Info' in analyzer_names, f"File_Info missing from {analyzer_names}"
-        assert 'ClamAV' in analyzer_names, f"ClamAV missing from {analyzer_names}"
-        assert len(reports) >= 2, f"Expected at least 2 reports, got {len(reports)}"
-    
-    def test_three_analyzers_sequential(self, workflow_tester, workflow_builder, safe_sample_path):
-        """
-        Workflow: File → File_Info → ClamAV → Strings_Info → Result
-        Expected: Result shows all 3 analyzer reports
-        """
-        file_id = workflow_builder.add_file_node()
-        analyzer1_id = workflow_builder.add_analyzer_node("File_Info", x=300)
-        analyzer2_id = workflow_builder.add_analyzer_node("ClamAV", x=500)
-        analyzer3_id = workflow_builder.add_analyzer_node("Strings_Info", x=700)
-        result_id = workflow_builder.add_result_node(x=900)
-        
-        workflow_builder.connect(file_id, analyzer1_id)
-        workflow_builder.connect(analyzer1_id, analyzer2_id)
-        workflow_builder.connect(analyzer2_id, analyzer3_id)
-        workflow_builder.connect(analyzer3_id, result_id)
-        
-        nodes, edges = workflow_builder.get_workflow()
-        result = workflow_tester.execute_workflow(nodes, edges, safe_sample_path)
-        
-        assert result.success, f"Workflow failed: {result.error}"
-        
-        reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
+        # CRITICAL: every analyzer in the chain should be in results
+        for analyzer in analyzers:
+            assert analyzer in analyzer_names, f"{analyzer} missing from {sorted(analyzer_names)}"
+        assert len(reports) >= len(analyzers), f"Expected at least {len(analyzers)} reports, got {len(reports)}"
         
-        assert 'File_Info' in analyzer_names
-        assert 'ClamAV' in analyzer_names
-        assert 'Strings_Info' in analyzer_names
-        assert len(reports) >= 3
+        # For safe file, detections should be empty
+        if 'ClamAV' in analyzers:
+            detections = result.analyzer_reports['ClamAV'].get('report', {}).get('detections', [])
+            assert len(detections) == 0, f"Expected no detections for safe file, got: {detections}"
 
 
 class TestLinearBranchingToMultipleResults:
@@ -185,7 +109,7 @@ class TestLinearBranchingToMultipleResults:
         # The frontend is responsible for distributing to correct result nodes
         # This test validates the backend correctly runs both analyzers
         reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
+        analyzer_names = result.analyzer_names
         
         assert 'File_Info' in analyzer_names
         assert 'ClamAV' in analyzer_names
@@ -219,7 +143,7 @@ class TestLinearBranchingToMultipleResults:
         assert result.success, f"Workflow failed: {result.error}"
         
         reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
+        analyzer_names = result.analyzer_names
         
         # All three analyzers should have run
         assert 'File_Info' in analyzer_names
@@ -254,7 +178,7 @@ class TestLinearEdgeCases:
         assert result.success, f"Workflow failed: {result.error}"
         
         reports = result.results.get('analyzer_reports', [])
-        analyzer_names = [r['name'] for r in reports]
+        analyzer_names = result.analyzer_names
         
         assert 'File_Info' in analyzer_names
         assert 'ClamAV' in analyzer_names
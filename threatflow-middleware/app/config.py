@@ -3,8 +3,9 @@ Configuration management using Pydantic Settings
 Loads environment variables from .env file
 """
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import FrozenSet, Optional
 
 class Settings(BaseSettings):
     # IntelOwl Configuration
@@ -17,21 +18,36 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     
     # CORS Configuration
-    CORS_ORIGINS: List[str] = [
-        "http://localhost:3000", 
-        "http://127.0.0.1:3000",
-        "http://localhost:3001",
-        "http://127.0.0.1:3001", 
-        "http://localhost:3002",
-        "http://127.0.0.1:3002"
-    ]
+    # A frozenset so the per-request origin check is a hash lookup
+    CORS_ORIGINS: FrozenSet[str] = frozenset(
+        f"http://{host}:{port}"
+        for host in ("localhost", "127.0.0.1")
+        for port in (3000, 3001, 3002)
+    )
+    # Optional extra pattern, e.g. r"http://(localhost|127\.0\.0\.1):\d+" for any dev port
+    CORS_ORIGIN_REGEX: Optional[str] = None
     
     # Timeouts (seconds)
     ANALYSIS_TIMEOUT: int = 300
-    POLL_INTERVAL: int = 5
+    # Job polling starts at POLL_INTERVAL and backs off 1.5x per poll up to
+    # POLL_MAX_INTERVAL, so fast analyzers are picked up within a fraction of a second
+    POLL_INTERVAL: float = 0.25
+    POLL_MAX_INTERVAL: float = 5.0
+    
+    # Reuse an IntelOwl job for the same file (MD5) and analyzers if one was
+    # started within this many minutes; 0 always submits a fresh analysis
+    ANALYSIS_REUSE_MINUTES: int = 0
+    
+    # Upper bound on conditional-workflow stages running IntelOwl jobs at once
+    MAX_PARALLEL_STAGES: int = 4
     
     class Config:
         env_file = ".env"
         case_sensitive = True
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide Settings instance; .env is read once (use with Depends(get_settings))"""
+    return Settings()
+
+settings = get_settings()
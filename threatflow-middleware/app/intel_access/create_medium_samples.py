@@ -7,12 +7,16 @@ Create 12 SAFE test samples for Medium File Analyzers (600-1100 MB total):
 - GoReSym (3 Go binaries, 100-200 MB)
 """
 
+import argparse
 import os
 import struct
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 import random
 import string
+import time
 
 # ---------- CONFIG ----------
 BASE_DIR = Path("/home/anonymous/COLLEGE/ThreatFlow/threatflow-middleware/app/intel_access/test_samples")
@@ -23,6 +27,13 @@ MALPEDIA_DIR = MEDIUM_ANALYZERS_DIR / "malpedia_scan"
 ONENOTE_DIR = MEDIUM_ANALYZERS_DIR / "onenote_info"
 GORESYM_DIR = MEDIUM_ANALYZERS_DIR / "gore_sym"
 
+# File-format headers shared by the sample writers
+_DOS_HEADER = b"MZ\x90\x90" + b"\x00" * 61
+_PE_HEADER = b"PE\x00\x00" + struct.pack("<HHIIIHH", 0x014C, 1, 0, 0, 0, 224, 0x0102)
+_ELF_HEADER = b"\x7fELF" + b"\x00" * 60
+_ONENOTE_HEADER = b"Microsoft Office OneNote Document" + b"\x00" * 100
+_GO_HEADER = b"Go\x1F\x8B\x08\x00\x00\x00\x00\x00\x00\xFF"  # Go binary magic
+
 
 def ensure_dirs():
     """Create all required directories"""
@@ -33,32 +44,94 @@ def ensure_dirs():
     print(f"✓ Created directories under: {MEDIUM_ANALYZERS_DIR}")
 
 
-def generate_random_bytes(size_mb: int) -> bytes:
-    """Generate random bytes for padding large files"""
-    size_bytes = size_mb * 1024 * 1024
-    return bytes(random.randrange(256) for _ in range(size_bytes))
+PADDING_CHUNK = 4 * 1024 * 1024
+
+
+def open_exec(path: Path, buffering: int = PADDING_CHUNK):
+    """Create/truncate path for binary writing with 0o755 mode bits in one open call"""
+    return os.fdopen(os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o755), "wb", buffering=buffering)
+
+
+def _needs_regen(path: Path, expected_size: int) -> bool:
+    """True unless path already exists with the expected size"""
+    return not path.exists() or path.stat().st_size != expected_size
+
+
+def write_padded(
+    path: Path,
+    header: bytes,
+    padding_mb: int,
+    chunk: int = PADDING_CHUNK,
+    executable: bool = False,
+    force: bool = False,
+    seed: Optional[int] = None
+) -> int:
+    """Write header followed by padding_mb of random bytes, streamed in chunks.
+
+    Padding comes from os.urandom one chunk at a time, so peak memory is a
+    couple of chunks instead of the whole file; a helper thread draws the next
+    chunk while the current one is written. With a seed, padding comes from
+    random.randbytes on a per-file RNG instead, so reruns with the same seed
+    write identical files regardless of process scheduling. The full size is
+    preallocated up front so the filesystem can hand out one contiguous extent.
+    Executable files are created through open_exec. The data goes to a
+    ".part" sibling that is renamed onto path only once fully written, so an
+    interrupted run never leaves a preallocated file of the final size behind.
+    A file that already has the expected size is kept as is unless force is
+    set. Returns the total file size in bytes.
+    """
+    remaining = padding_mb * 1024 * 1024
+    total = len(header) + remaining
+    if not force and not _needs_regen(path, total):
+        return total
+    rng = random.Random(f"{seed}:{path.name}") if seed is not None else None
+    draw = rng.randbytes if rng else os.urandom
+    part = path.with_suffix(path.suffix + ".part")
+    with (open_exec(part, chunk) if executable else open(part, "wb", buffering=chunk)) as f:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(f.fileno(), 0, total)
+        else:
+            f.truncate(total)
+        f.write(header)
+        # Double buffering: one chunk in flight in the producer while this
+        # thread writes the previous one (os.urandom and write release the GIL)
+        with ThreadPoolExecutor(max_workers=1) as producer:
+            pending = producer.submit(draw, min(chunk, remaining)) if remaining else None
+            while pending is not None:
+                block = pending.result()
+                remaining -= len(block)
+                pending = producer.submit(draw, min(chunk, remaining)) if remaining else None
+                f.write(block)
+    os.replace(part, path)
+    return total
+
+
+# PE section padding patterns (NOP sleds, API calls, etc. - SAFE), built once
+_NOP = b"\x90" * 1024  # NOP sled
+_INT3 = b"\xCC" * 512  # INT3 breakpoints
+_ZERO = b"\x00" * 2048  # Zero padding
+_VA = struct.pack("<I", 0x400000) * 256  # Virtual addresses
+_PADDING_BLOCKS = (_NOP, _INT3, _ZERO, _VA)
 
 
 def generate_peframe_padding() -> bytes:
     """Generate PE-compatible padding data"""
-    # PE section padding patterns (NOP sleds, API calls, etc. - SAFE)
-    patterns = [
-        b"\x90" * 1024,  # NOP sled
-        b"\xCC" * 512,   # INT3 breakpoints
-        b"\x00" * 2048,  # Zero padding
-        struct.pack("<I", 0x400000) * 256,  # Virtual addresses
-    ]
-    return b"".join(random.choices(patterns, k=100))  # ~1MB instead of 200MB
+    picks = [_PADDING_BLOCKS[i] for i in random.choices(range(len(_PADDING_BLOCKS)), k=100)]
+    buf = bytearray(sum(map(len, picks)))  # ~100-200KB, allocated once
+    off = 0
+    for blk in picks:
+        buf[off:off + len(blk)] = blk
+        off += len(blk)
+    return bytes(buf)
 
 
 # ---------- PEFRAME_SCAN SAMPLES (PE Analysis) ----------
 
-def create_peframe_samples():
+def create_peframe_samples(force: bool = False, seed: Optional[int] = None):
     """Create 200-300MB PE files for PEframe_Scan"""
 
     # SAFE PE 1 - Large legitimate-like PE
     pe_safe1 = PEFRAME_DIR / "safe" / "sample1_large_app.exe"
-    padding = generate_random_bytes(2)  # 2MB instead of 250MB
     strings = """
 LargeApplication.exe v2.0
 Copyright 2025 LegitimateCorp
@@ -67,17 +140,11 @@ Microsoft Visual Studio 2022
 Compiled: Nov 29 2025 04:15:00
 """
     # Minimal PE header + large padding + strings
-    dos_header = b"MZ\x90\x90" + b"\x00" * 61
-    pe_header = b"PE\x00\x00" + struct.pack("<HHIIIHH", 0x014C, 1, 0, 0, 0, 224, 0x0102)
-
-    data = dos_header + pe_header + strings.encode() + padding
-    with open(pe_safe1, "wb") as f:
-        f.write(data)
-    print(f"✓ PEframe safe1: {pe_safe1} ({len(data)/1024/1024:.1f}MB)")
+    size = write_padded(pe_safe1, _DOS_HEADER + _PE_HEADER + strings.encode(), 2, force=force, seed=seed)  # 2MB instead of 250MB
+    print(f"✓ PEframe safe1: {pe_safe1} ({size/1024/1024:.1f}MB)")
 
     # SAFE PE 2 - Medium PE
     pe_safe2 = PEFRAME_DIR / "safe" / "sample2_enterprise.exe"
-    padding2 = generate_random_bytes(1)  # 1MB instead of 180MB
     strings2 = """
 EnterpriseSuite.exe
 Active Directory Integration Module
@@ -85,10 +152,8 @@ SQL Server Database Connector
 Windows Event Log Parser
 Network Traffic Monitor
 """
-    data2 = dos_header + pe_header + strings2.encode() + padding2
-    with open(pe_safe2, "wb") as f:
-        f.write(data2)
-    print(f"✓ PEframe safe2: {pe_safe2} ({len(data2)/1024/1024:.1f}MB)")
+    size2 = write_padded(pe_safe2, _DOS_HEADER + _PE_HEADER + strings2.encode(), 1, force=force, seed=seed)  # 1MB instead of 180MB
+    print(f"✓ PEframe safe2: {pe_safe2} ({size2/1024/1024:.1f}MB)")
 
     # SUSPICIOUS PE - Large with malware-like strings (SAFE)
     pe_susp1 = PEFRAME_DIR / "suspicious" / "sample1_packed_malware.exe"
@@ -104,35 +169,36 @@ hook_ntdll
 bypass_amsi
 disable_wd
 """
-    padding_susp = generate_random_bytes(3)  # 3MB instead of 220MB
-    data_susp = dos_header + pe_header + susp_strings.encode() + padding_susp
-    with open(pe_susp1, "wb") as f:
-        f.write(data_susp)
-    print(f"✓ PEframe susp1: {pe_susp1} ({len(data_susp)/1024/1024:.1f}MB)")
+    size_susp = write_padded(pe_susp1, _DOS_HEADER + _PE_HEADER + susp_strings.encode(), 3, force=force, seed=seed)  # 3MB instead of 220MB
+    print(f"✓ PEframe susp1: {pe_susp1} ({size_susp/1024/1024:.1f}MB)")
 
 
 # ---------- MALPEDIA_SCAN SAMPLES (Malware Family Detection) ----------
 
-def create_malpedia_samples():
+def create_malpedia_samples(force: bool = False, seed: Optional[int] = None):
     """Create 200-400MB mixed format files for Malpedia_Scan"""
 
     # SAFE 1 - Large ZIP with mixed content
     mal_safe1 = MALPEDIA_DIR / "safe" / "sample1_legit_archive.zip"
-    with zipfile.ZipFile(mal_safe1, "w", zipfile.ZIP_DEFLATED) as zf:
+    with open(mal_safe1, "wb", buffering=PADDING_CHUNK) as raw, zipfile.ZipFile(raw, "w", zipfile.ZIP_DEFLATED) as zf:
         zf.writestr("legit_app.exe", "Legitimate application binary")
         zf.writestr("config.ini", "[Settings]\nserver=localhost\nport=8080")
-        # Add small padding file instead of 300MB
-        padding_file = generate_random_bytes(1)  # 1MB instead of 300MB
-        zf.writestr("data.bin", padding_file)
+        # Add small padding file instead of 300MB, streamed into the entry;
+        # random bytes don't compress, so store it rather than deflate it
+        data_info = zipfile.ZipInfo("data.bin", time.localtime()[:6])
+        data_info.compress_type = zipfile.ZIP_STORED
+        remaining = 1 * 1024 * 1024  # 1MB instead of 300MB
+        rng = random.Random(f"{seed}:{mal_safe1.name}") if seed is not None else None
+        with zf.open(data_info, "w", force_zip64=True) as entry:
+            while remaining:
+                n = min(PADDING_CHUNK, remaining)
+                entry.write(rng.randbytes(n) if rng else os.urandom(n))
+                remaining -= n
     print(f"✓ Malpedia safe1: {mal_safe1}")
 
     # SAFE 2 - Large ELF + PE hybrid-like file
     mal_safe2 = MALPEDIA_DIR / "safe" / "sample2_hybrid.bin"
-    elf_header = b"\x7fELF" + b"\x00"*60
-    pe_header = b"MZ\x90\x90" + b"\x00"*61
-    data = elf_header + pe_header + generate_random_bytes(2)  # 2MB instead of 280MB
-    with open(mal_safe2, "wb") as f:
-        f.write(data)
+    write_padded(mal_safe2, _ELF_HEADER + _DOS_HEADER, 2, force=force, seed=seed)  # 2MB instead of 280MB
     print(f"✓ Malpedia safe2: {mal_safe2} (~3MB)")
 
     # SUSPICIOUS - Multi-family indicators (SAFE strings only)
@@ -151,20 +217,17 @@ Ransomware:
 encrypt_files
 bitcoin_wallet
 """
-    data_susp = b"MZ" + susp_content.encode() + generate_random_bytes(3)  # 3MB instead of 320MB
-    with open(mal_susp1, "wb") as f:
-        f.write(data_susp)
+    write_padded(mal_susp1, b"MZ" + susp_content.encode(), 3, force=force, seed=seed)  # 3MB instead of 320MB
     print(f"✓ Malpedia susp1: {mal_susp1} (~4MB)")
 
 
 # ---------- ONENOTE_INFO SAMPLES (OneNote Analysis) ----------
 
-def create_onenote_samples():
+def create_onenote_samples(force: bool = False, seed: Optional[int] = None):
     """Create 100-200MB OneNote-like files"""
 
     # SAFE 1 - Minimal OneNote structure
     on_safe1 = ONENOTE_DIR / "safe" / "sample1_meeting_notes.one"
-    onenote_header = b"Microsoft Office OneNote Document" + b"\x00"*100
     content = """
 Meeting Notes - Project Alpha
 Date: 2025-11-29
@@ -174,17 +237,13 @@ Agenda:
 2. Security Review
 3. Budget Allocation
 """
-    data = onenote_header + content.encode() + generate_random_bytes(1)  # 1MB instead of 120MB
-    with open(on_safe1, "wb") as f:
-        f.write(data)
+    write_padded(on_safe1, _ONENOTE_HEADER + content.encode(), 1, force=force, seed=seed)  # 1MB instead of 120MB
     print(f"✓ OneNote safe1: {on_safe1} (~2MB)")
 
     # SAFE 2 - Large notes file
     on_safe2 = ONENOTE_DIR / "safe" / "sample2_project_docs.one"
     large_content = "Project documentation page " * 1000  # Much smaller content
-    data2 = onenote_header + large_content.encode() + generate_random_bytes(1)  # 1MB instead of 80MB
-    with open(on_safe2, "wb") as f:
-        f.write(data2)
+    write_padded(on_safe2, _ONENOTE_HEADER + large_content.encode(), 1, force=force, seed=seed)  # 1MB instead of 80MB
     print(f"✓ OneNote safe2: {on_safe2} (~2MB)")
 
     # SUSPICIOUS - OneNote with embedded script-like content
@@ -200,20 +259,15 @@ End Sub
 
 Link: hxxp://127.0.0.1/malicious.doc
 """
-    data_susp = onenote_header + macro_content.encode() + generate_random_bytes(1)  # 1MB instead of 110MB
-    with open(on_susp1, "wb") as f:
-        f.write(data_susp)
+    write_padded(on_susp1, _ONENOTE_HEADER + macro_content.encode(), 1, force=force, seed=seed)  # 1MB instead of 110MB
     print(f"✓ OneNote susp1: {on_susp1} (~2MB)")
 
 
 # ---------- GORESYM SAMPLES (Go Binaries) ----------
 
-def create_gore_sym_samples():
+def create_gore_sym_samples(force: bool = False, seed: Optional[int] = None):
     """Create Go binary-like files (100-200MB)"""
 
-    # Go binary magic + strings
-    go_header = b"Go\x1F\x8B\x08\x00\x00\x00\x00\x00\x00\xFF"
-
     # SAFE 1 - Legitimate Go app
     go_safe1 = GORESYM_DIR / "safe" / "sample1_goserver"
     go_strings1 = """
@@ -226,10 +280,7 @@ Health check OK
 User login successful
 API rate limit: 1000/min
 """
-    data1 = go_header + go_strings1.encode() + generate_random_bytes(140)
-    with open(go_safe1, "wb") as f:
-        f.write(data1)
-    os.chmod(go_safe1, 0o755)
+    write_padded(go_safe1, _GO_HEADER + go_strings1.encode(), 140, executable=True, force=force, seed=seed)
     print(f"✓ GoReSym safe1: {go_safe1} (~160MB)")
 
     # SAFE 2 - Go CLI tool
@@ -241,10 +292,7 @@ context.Background()
 time.Sleep()
 os/exec.Command()
 """
-    data2 = go_header + go_strings2.encode() + generate_random_bytes(110)
-    with open(go_safe2, "wb") as f:
-        f.write(data2)
-    os.chmod(go_safe2, 0o755)
+    write_padded(go_safe2, _GO_HEADER + go_strings2.encode(), 110, executable=True, force=force, seed=seed)
     print(f"✓ GoReSym safe2: {go_safe2} (~130MB)")
 
     # SUSPICIOUS Go - C2-like patterns
@@ -258,21 +306,25 @@ keylog_callback
 process_injection
 persist_service
 """
-    data_susp = go_header + go_susp_strings.encode() + generate_random_bytes(150)
-    with open(go_susp1, "wb") as f:
-        f.write(data_susp)
-    os.chmod(go_susp1, 0o755)
+    write_padded(go_susp1, _GO_HEADER + go_susp_strings.encode(), 150, executable=True, force=force, seed=seed)
     print(f"✓ GoReSym susp1: {go_susp1} (~170MB)")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Create SAFE test samples for medium file analyzers")
+    parser.add_argument("--force", action="store_true", help="rewrite samples even if a file of the expected size exists")
+    parser.add_argument("--seed", type=int, help="derive padding from this seed for reproducible samples (combine with --force to rewrite existing ones)")
+    args = parser.parse_args()
+
     print("🚀 Creating 12 MEDIUM FILE ANALYZER test samples...")
     ensure_dirs()
 
-    create_peframe_samples()
-    create_malpedia_samples()
-    create_onenote_samples()
-    create_gore_sym_samples()
+    # Each family writes to its own directory, so build them in parallel;
+    # result() re-raises any worker failure here
+    creators = [create_peframe_samples, create_malpedia_samples, create_onenote_samples, create_gore_sym_samples]
+    with ProcessPoolExecutor(max_workers=len(creators)) as ex:
+        for future in [ex.submit(create, args.force, args.seed) for create in creators]:
+            future.result()
 
     print("\n" + "="*60)
     print("✓ SUCCESS: Created 12 SAFE samples (600-1100MB total)")
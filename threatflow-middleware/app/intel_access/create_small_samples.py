@@ -24,6 +24,16 @@ MALPEDIA_DIR = MEDIUM_ANALYZERS_DIR / "malpedia_scan"
 ONENOTE_DIR = MEDIUM_ANALYZERS_DIR / "onenote_info"
 GORESYM_DIR = MEDIUM_ANALYZERS_DIR / "gore_sym"
 
+# Precompiled little-endian layouts for the PE/ELF builders
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_COFF = struct.Struct("<HHIIIHH")
+_SECTION = struct.Struct("<8sIIIIIIHHI")
+_ELF_PH = struct.Struct("<IIQQQQQQ")
+
+ZIP_BUFFER = 64 * 1024
+
 
 def ensure_dirs():
     for d in [PEFRAME_DIR, MALPEDIA_DIR, ONENOTE_DIR, GORESYM_DIR]:
@@ -36,16 +46,19 @@ def ensure_dirs():
 def create_minimal_pe(filepath: Path, extra_strings: str = ""):
     """Very small PE-like file, good enough for PEframe + DetectItEasy."""
     filepath = Path(filepath)
-    dos_header = b"MZ" + b"\x90" * 58 + struct.pack("<I", 0x40)
-    pe_sig = b"PE\x00\x00"
-    coff = struct.pack("<HHIIIHH", 0x014C, 1, 0, 0, 0, 0xE0, 0x0102)
-    opt = bytearray(0xE0)
-    opt[0:2] = struct.pack("<H", 0x010B)  # PE32
-    section_name = b".text\x00\x00\x00"
     body = (b"LEGIT_APP" + extra_strings.encode("utf-8", errors="ignore"))
-    sec = struct.pack(
-        "<8sIIIIIIHHI",
-        section_name,
+    # Headers packed in place into one zeroed buffer; body starts at file alignment 0x200
+    pe = bytearray(0x200 + len(body))
+    pe[0:2] = b"MZ"
+    pe[2:60] = b"\x90" * 58
+    _U32.pack_into(pe, 60, 0x40)  # e_lfanew
+    pe[0x40:0x44] = b"PE\x00\x00"
+    _COFF.pack_into(pe, 0x44, 0x014C, 1, 0, 0, 0, 0xE0, 0x0102)
+    opt = 0x44 + _COFF.size
+    _U16.pack_into(pe, opt, 0x010B)  # PE32
+    _SECTION.pack_into(
+        pe, opt + 0xE0,
+        b".text\x00\x00\x00",
         len(body),
         0x1000,
         len(body),
@@ -53,10 +66,7 @@ def create_minimal_pe(filepath: Path, extra_strings: str = ""):
         0, 0, 0, 0,
         0x60000020,
     )
-    pe = dos_header + pe_sig + coff + opt + sec
-    if len(pe) < 0x200:
-        pe += b"\x00" * (0x200 - len(pe))
-    pe += body
+    pe[0x200:] = body
     filepath.parent.mkdir(parents=True, exist_ok=True)
     filepath.write_bytes(pe)
     return filepath
@@ -70,44 +80,45 @@ def create_minimal_elf(filepath: Path, is_shared_lib: bool = False):
     elf[4] = 2  # 64-bit
     elf[5] = 1  # LE
     elf[6] = 1
-    elf[16:18] = struct.pack("<H", 3 if is_shared_lib else 2)  # DYN/EXEC
-    elf[18:20] = struct.pack("<H", 0x3E)  # x86-64
-    elf[20:24] = struct.pack("<I", 1)
-    elf[24:32] = struct.pack("<Q", 0x400000 if not is_shared_lib else 0)
-    elf[32:40] = struct.pack("<Q", 64)       # phoff
-    elf[40:48] = struct.pack("<Q", 64 + 56)  # shoff
-    elf[52:54] = struct.pack("<H", 64)
-    elf[54:56] = struct.pack("<H", 56)
-    elf[56:58] = struct.pack("<H", 1)
-    elf[58:60] = struct.pack("<H", 64)
-    elf[60:62] = struct.pack("<H", 3)
-    elf[62:64] = struct.pack("<H", 2)
-
-    ph = bytearray(56)
-    ph[0:4] = struct.pack("<I", 1)   # PT_LOAD
-    ph[4:8] = struct.pack("<I", 5)   # R|X
-    ph[8:16] = struct.pack("<Q", 0)
-    ph[16:24] = struct.pack("<Q", 0x400000)
-    ph[24:32] = struct.pack("<Q", 0x400000)
-    ph[32:40] = struct.pack("<Q", 0x200)
-    ph[40:48] = struct.pack("<Q", 0x200)
-    ph[48:56] = struct.pack("<Q", 0x1000)
+    _U16.pack_into(elf, 16, 3 if is_shared_lib else 2)  # DYN/EXEC
+    _U16.pack_into(elf, 18, 0x3E)  # x86-64
+    _U32.pack_into(elf, 20, 1)
+    _U64.pack_into(elf, 24, 0x400000 if not is_shared_lib else 0)
+    _U64.pack_into(elf, 32, 64)       # phoff
+    _U64.pack_into(elf, 40, 64 + 56)  # shoff
+    _U16.pack_into(elf, 52, 64)
+    _U16.pack_into(elf, 54, 56)
+    _U16.pack_into(elf, 56, 1)
+    _U16.pack_into(elf, 58, 64)
+    _U16.pack_into(elf, 60, 3)
+    _U16.pack_into(elf, 62, 2)
+
+    ph = _ELF_PH.pack(
+        1,         # PT_LOAD
+        5,         # R|X
+        0,
+        0x400000,
+        0x400000,
+        0x200,
+        0x200,
+        0x1000,
+    )
 
     sh = bytearray()
     sh += bytearray(64)
     text = bytearray(64)
-    text[0:4] = struct.pack("<I", 1)
-    text[4:8] = struct.pack("<I", 1)    # PROGBITS
-    text[8:16] = struct.pack("<Q", 6)   # ALLOC|EXEC
-    text[16:24] = struct.pack("<Q", 0x400000)
-    text[24:32] = struct.pack("<Q", 0x200)
-    text[32:40] = struct.pack("<Q", 64)
+    _U32.pack_into(text, 0, 1)
+    _U32.pack_into(text, 4, 1)    # PROGBITS
+    _U64.pack_into(text, 8, 6)   # ALLOC|EXEC
+    _U64.pack_into(text, 16, 0x400000)
+    _U64.pack_into(text, 24, 0x200)
+    _U64.pack_into(text, 32, 64)
     sh += text
     shstr = bytearray(64)
-    shstr[0:4] = struct.pack("<I", 7)
-    shstr[4:8] = struct.pack("<I", 3)
-    shstr[24:32] = struct.pack("<Q", 64 + 56 + 192)
-    shstr[32:40] = struct.pack("<Q", 20)
+    _U32.pack_into(shstr, 0, 7)
+    _U32.pack_into(shstr, 4, 3)
+    _U64.pack_into(shstr, 24, 64 + 56 + 192)
+    _U64.pack_into(shstr, 32, 20)
     sh += shstr
 
     strtab = b"\x00.text\x00.shstrtab\x00"
@@ -175,10 +186,12 @@ InjectExplorer
 
     # Safe archive with mixed benign files
     zip_path = MALPEDIA_DIR / "safe" / "malpedia_legit_bundle.zip"
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+    # 64 KiB write buffer batches the many small header/entry writes; random
+    # bytes don't compress, so that entry is stored rather than deflated
+    with open(zip_path, "wb", buffering=ZIP_BUFFER) as raw, zipfile.ZipFile(raw, "w", zipfile.ZIP_DEFLATED) as zf:
         zf.writestr("readme.txt", "Legitimate bundle for Malpedia_Scan testing only.\n")
         zf.writestr("config.json", json.dumps({"family": "test", "type": "benign"}, indent=2))
-        zf.writestr("dummy.bin", random_bytes(4096))
+        zf.writestr("dummy.bin", random_bytes(4096), compress_type=zipfile.ZIP_STORED)
 
 
 # ---------- OneNote_Info (3 small OneNote-like) ----------
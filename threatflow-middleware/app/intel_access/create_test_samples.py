@@ -18,6 +18,16 @@ FLOSS_DIR = BASE_DIR / "floss_samples"
 DIE_DIR = BASE_DIR / "detectiteasy_samples"
 ELF_DIR = BASE_DIR / "elf_samples"
 
+# Precompiled little-endian layouts for the PE/ELF builders
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_COFF = struct.Struct("<HHIIIHH")
+_SECTION = struct.Struct("<8sIIIIIIHHI")
+_ELF_PH = struct.Struct("<IIQQQQQQ")
+
+ZIP_BUFFER = 64 * 1024
+
 
 def ensure_dirs():
     for base in (FLOSS_DIR, DIE_DIR, ELF_DIR):
@@ -30,17 +40,23 @@ def ensure_dirs():
 def create_minimal_pe_with_strings(filepath: Path, strings_data: str):
     """Create a minimal PE-like file with embedded strings (good enough for Floss/DetectItEasy)."""
     filepath = Path(filepath)
+    section_data = strings_data.encode("utf-8", errors="ignore")
+    virtual_size = len(section_data)
+
+    # One zeroed buffer for the whole file; headers are packed at their offsets
+    # and the section data starts at file alignment 0x200
+    pe_data = bytearray(0x200 + len(section_data))
+
     # Minimal DOS header
-    dos_header = bytearray(64)
-    dos_header[0:2] = b"MZ"
-    dos_header[60:64] = struct.pack("<I", 64)  # e_lfanew
+    pe_data[0:2] = b"MZ"
+    _U32.pack_into(pe_data, 60, 64)  # e_lfanew
 
     # PE signature
-    pe_signature = b"PE\x00\x00"
+    pe_data[64:68] = b"PE\x00\x00"
 
     # COFF header (20 bytes)
-    coff_header = struct.pack(
-        "<HHIIIHH",
+    _COFF.pack_into(
+        pe_data, 68,
         0x014C,  # i386
         1,       # sections
         0, 0, 0,
@@ -49,22 +65,18 @@ def create_minimal_pe_with_strings(filepath: Path, strings_data: str):
     )
 
     # Optional header (PE32, minimal)
-    optional_header = bytearray(224)
-    optional_header[0:2] = struct.pack("<H", 0x010B)  # PE32
-    optional_header[16:20] = struct.pack("<I", 0x1000)   # BaseOfCode
-    optional_header[20:24] = struct.pack("<I", 0x2000)   # BaseOfData
-    optional_header[24:28] = struct.pack("<I", 0x400000) # ImageBase
-    optional_header[28:32] = struct.pack("<I", 0x1000)   # SectionAlignment
-    optional_header[32:36] = struct.pack("<I", 0x200)    # FileAlignment
+    opt = 68 + _COFF.size
+    _U16.pack_into(pe_data, opt, 0x010B)  # PE32
+    _U32.pack_into(pe_data, opt + 16, 0x1000)   # BaseOfCode
+    _U32.pack_into(pe_data, opt + 20, 0x2000)   # BaseOfData
+    _U32.pack_into(pe_data, opt + 24, 0x400000) # ImageBase
+    _U32.pack_into(pe_data, opt + 28, 0x1000)   # SectionAlignment
+    _U32.pack_into(pe_data, opt + 32, 0x200)    # FileAlignment
 
     # Section header (.text)
-    section_name = b".text\x00\x00\x00"
-    section_data = strings_data.encode("utf-8", errors="ignore")
-    virtual_size = len(section_data)
-
-    section_header = struct.pack(
-        "<8sIIIIIIHHI",
-        section_name,
+    _SECTION.pack_into(
+        pe_data, opt + 224,
+        b".text\x00\x00\x00",
         virtual_size,          # VirtualSize
         0x1000,                # VirtualAddress
         len(section_data),     # SizeOfRawData
@@ -73,10 +85,7 @@ def create_minimal_pe_with_strings(filepath: Path, strings_data: str):
         0x60000020,            # code | execute | read
     )
 
-    pe_data = dos_header + pe_signature + coff_header + optional_header + section_header
-    if len(pe_data) < 0x200:
-        pe_data += b"\x00" * (0x200 - len(pe_data))
-    pe_data += section_data
+    pe_data[0x200:] = section_data
 
     filepath.parent.mkdir(parents=True, exist_ok=True)
     with open(filepath, "wb") as f:
@@ -97,37 +106,38 @@ def create_minimal_elf(filepath: Path, is_shared_lib: bool = False):
     elf_header[6] = 1  # version
 
     # e_type
-    elf_header[16:18] = struct.pack("<H", 3 if is_shared_lib else 2)  # DYN or EXEC
+    _U16.pack_into(elf_header, 16, 3 if is_shared_lib else 2)  # DYN or EXEC
     # e_machine: x86-64
-    elf_header[18:20] = struct.pack("<H", 0x3E)
+    _U16.pack_into(elf_header, 18, 0x3E)
     # e_version
-    elf_header[20:24] = struct.pack("<I", 1)
+    _U32.pack_into(elf_header, 20, 1)
     # e_entry
-    elf_header[24:32] = struct.pack("<Q", 0x400000 if not is_shared_lib else 0)
+    _U64.pack_into(elf_header, 24, 0x400000 if not is_shared_lib else 0)
     # e_phoff
-    elf_header[32:40] = struct.pack("<Q", 64)
+    _U64.pack_into(elf_header, 32, 64)
     # e_shoff
-    elf_header[40:48] = struct.pack("<Q", 64 + 56)
+    _U64.pack_into(elf_header, 40, 64 + 56)
     # e_ehsize
-    elf_header[52:54] = struct.pack("<H", 64)
+    _U16.pack_into(elf_header, 52, 64)
     # e_phentsize / e_phnum
-    elf_header[54:56] = struct.pack("<H", 56)
-    elf_header[56:58] = struct.pack("<H", 1)
+    _U16.pack_into(elf_header, 54, 56)
+    _U16.pack_into(elf_header, 56, 1)
     # e_shentsize / e_shnum / e_shstrndx
-    elf_header[58:60] = struct.pack("<H", 64)
-    elf_header[60:62] = struct.pack("<H", 3)
-    elf_header[62:64] = struct.pack("<H", 2)
+    _U16.pack_into(elf_header, 58, 64)
+    _U16.pack_into(elf_header, 60, 3)
+    _U16.pack_into(elf_header, 62, 2)
 
     # Program header
-    ph = bytearray(56)
-    ph[0:4] = struct.pack("<I", 1)  # PT_LOAD
-    ph[4:8] = struct.pack("<I", 5)  # R|X
-    ph[8:16] = struct.pack("<Q", 0)         # offset
-    ph[16:24] = struct.pack("<Q", 0x400000) # vaddr
-    ph[24:32] = struct.pack("<Q", 0x400000) # paddr
-    ph[32:40] = struct.pack("<Q", 0x1000)   # filesz
-    ph[40:48] = struct.pack("<Q", 0x1000)   # memsz
-    ph[48:56] = struct.pack("<Q", 0x1000)   # align
+    ph = _ELF_PH.pack(
+        1,         # PT_LOAD
+        5,         # R|X
+        0,         # offset
+        0x400000,  # vaddr
+        0x400000,  # paddr
+        0x1000,    # filesz
+        0x1000,    # memsz
+        0x1000,    # align
+    )
 
     # Section headers (3)
     sh = bytearray()
@@ -135,20 +145,20 @@ def create_minimal_elf(filepath: Path, is_shared_lib: bool = False):
 
     # .text
     text = bytearray(64)
-    text[0:4] = struct.pack("<I", 1)    # name offset
-    text[4:8] = struct.pack("<I", 1)    # PROGBITS
-    text[8:16] = struct.pack("<Q", 6)   # ALLOC|EXEC
-    text[16:24] = struct.pack("<Q", 0x400000)
-    text[24:32] = struct.pack("<Q", 0x1000)
-    text[32:40] = struct.pack("<Q", 100)
+    _U32.pack_into(text, 0, 1)    # name offset
+    _U32.pack_into(text, 4, 1)    # PROGBITS
+    _U64.pack_into(text, 8, 6)   # ALLOC|EXEC
+    _U64.pack_into(text, 16, 0x400000)
+    _U64.pack_into(text, 24, 0x1000)
+    _U64.pack_into(text, 32, 100)
     sh += text
 
     # .shstrtab
     shstr = bytearray(64)
-    shstr[0:4] = struct.pack("<I", 7)
-    shstr[4:8] = struct.pack("<I", 3)  # STRTAB
-    shstr[24:32] = struct.pack("<Q", 64 + 56 + 192)
-    shstr[32:40] = struct.pack("<Q", 20)
+    _U32.pack_into(shstr, 0, 7)
+    _U32.pack_into(shstr, 4, 3)  # STRTAB
+    _U64.pack_into(shstr, 24, 64 + 56 + 192)
+    _U64.pack_into(shstr, 32, 20)
     sh += shstr
 
     string_table = b"\x00.text\x00.shstrtab\x00"
@@ -261,7 +271,7 @@ def create_die_samples():
 
     # SAFE 2 – zip
     p2 = DIE_DIR / "safe" / "sample2_archive.zip"
-    with zipfile.ZipFile(p2, "w", zipfile.ZIP_DEFLATED) as zf:
+    with open(p2, "wb", buffering=ZIP_BUFFER) as raw, zipfile.ZipFile(raw, "w", zipfile.ZIP_DEFLATED) as zf:
         zf.writestr("readme.txt", "This is a test ZIP archive\n")
         zf.writestr("data/config.ini", "[Settings]\nport=8080\n")
         zf.writestr("data/sample.log", "INFO: Application started\n")
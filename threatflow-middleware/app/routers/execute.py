@@ -1,10 +1,11 @@
 """Workflow execution endpoints"""
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
 from app.services.intelowl_service import intel_service
 from app.services.workflow_parser import workflow_parser
 from app.models.workflow import WorkflowRequest, JobStatusResponse, AnalyzerInfo
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 import json
 import shutil
@@ -17,6 +18,9 @@ logger = logging.getLogger(__name__)
 # In production, this would be stored in a database
 _workflow_routing_store: Dict[int, List[Dict[str, Any]]] = {}
 
+# Seconds between IntelOwl checks while a status request is long-polling
+LONG_POLL_INTERVAL = 1.0
+
 @router.post("/execute")
 async def execute_workflow(
     workflow_json: str = Form(...),
@@ -56,15 +60,11 @@ async def execute_workflow(
             # Cleanup temp file
             os.remove(temp_path)
             
-            # Build routing metadata for frontend
-            stagerouting = []
-            for stage in stages:
-                stagerouting.append({
-                    "stage_id": stage["stage_id"],
-                    "target_nodes": stage.get("target_nodes", []),
-                    "executed": stage["stage_id"] in result["executed_stages"],
-                    "analyzers": stage.get("analyzers", [])
-                })
+            # Routing metadata for frontend: the parser's skeleton plus executed flags
+            stagerouting = execution_plan["stage_routing"]
+            executed = set(result["executed_stages"])
+            for stage in stagerouting:
+                stage["executed"] = stage["stage_id"] in executed
             
             # Store routing metadata for status polling
             for job_id in result["job_ids"]:
@@ -99,14 +99,9 @@ async def execute_workflow(
             os.remove(temp_path)
             
             # For linear workflows, route all analyzers to all result nodes
-            result_nodes = [node.id for node in workflow.nodes if node.type == "result"]
-            
-            stagerouting = [{
-                "stage_id": 0,
-                "target_nodes": result_nodes,
-                "executed": True,
-                "analyzers": analyzers
-            }]
+            stagerouting = execution_plan["stage_routing"]
+            for stage in stagerouting:
+                stage["executed"] = True
             
             # Store routing metadata for status polling
             _workflow_routing_store[job_id] = stagerouting
@@ -131,11 +126,21 @@ async def execute_workflow(
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 @router.get("/status/{job_id}", response_model=JobStatusResponse)
-async def get_job_status(job_id: int):
-    """Get current status of IntelOwl job"""
+async def get_job_status(
+    job_id: int,
+    wait: Optional[int] = Query(None, ge=0, le=60, description="Seconds to hold the request until the job finishes")
+):
+    """Get current status of IntelOwl job, optionally long-polling until it finishes"""
     try:
         status = await intel_service.get_job_status(job_id)
         
+        if wait:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + wait
+            while status["results"] is None and loop.time() < deadline:
+                await asyncio.sleep(min(LONG_POLL_INTERVAL, deadline - loop.time()))
+                status = await intel_service.get_job_status(job_id)
+        
         # Include stored routing metadata if available
         if job_id in _workflow_routing_store:
             status["stagerouting"] = _workflow_routing_store[job_id]
@@ -8,7 +8,8 @@ Field paths are verified against real response data from testing_responses/respo
 """
 
 import logging
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from app.services.analyzer_schema import schema_manager
 
 logger = logging.getLogger(__name__)
@@ -32,6 +33,31 @@ VERIFIED_MALWARE_INDICATORS = {
 }
 
 
+# An unparseable index; navigation through it on a list yields None
+_BAD_INDEX = object()
+
+
+@lru_cache(maxsize=512)
+def _compile_field_path(field_path: str) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Split a dot-notation path into (key, index) steps once per distinct path
+    
+    index is None for plain keys, an int for "key[n]", or _BAD_INDEX.
+    """
+    steps = []
+    for part in field_path.split("."):
+        if "[" in part and "]" in part:
+            index_str = part[part.index("[")+1:part.index("]")]
+            try:
+                index = int(index_str)
+            except ValueError:
+                index = _BAD_INDEX
+            steps.append((part[:part.index("[")], index))
+        else:
+            steps.append((part, None))
+    return tuple(steps)
+
+
 class ConditionEvaluatorMixin:
     """
     Mixin class containing all condition evaluation strategies
@@ -218,22 +244,19 @@ class ConditionEvaluatorMixin:
             return data
         
         current = data
-        parts = field_path.split(".")
         
-        for part in parts:
+        for part, index in _compile_field_path(field_path):
             # Handle array indexing
-            if "[" in part and "]" in part:
-                field_name = part[:part.index("[")]
-                index_str = part[part.index("[")+1:part.index("]")]
-                
+            if index is not None:
                 if isinstance(current, dict):
-                    current = current.get(field_name)
+                    current = current.get(part)
                 
                 if isinstance(current, list):
+                    if index is _BAD_INDEX:
+                        return None
                     try:
-                        index = int(index_str)
                         current = current[index] if index < len(current) else None
-                    except (ValueError, IndexError):
+                    except IndexError:
                         return None
             else:
                 # Normal dict navigation
@@ -12,6 +12,7 @@ from app.services.analyzer_schema import schema_manager, AnalyzerSchemaManager
 from app.services.condition_evaluator import ConditionEvaluatorMixin
 import logging
 import asyncio
+import hashlib
 import subprocess
 import json
 from typing import List, Dict, Any, Optional, Tuple
@@ -65,6 +66,9 @@ class IntelOwlService(ConditionEvaluatorMixin):
         "Lnk_Info", "Suricata", "IocExtract", "IocFinder"
     }
     
+    # Availability statuses whose job can stand in for a new submission
+    REUSABLE_JOB_STATUSES = {"running", "reported_without_fails", "reported_with_fails"}
+    
     # Observable analyzers requiring observable_analyzers container
     OBSERVABLE_ANALYZERS = {
         "Classic_DNS", "CloudFlare_DNS", "CloudFlare_Malicious_Detector",
@@ -177,7 +181,8 @@ class IntelOwlService(ConditionEvaluatorMixin):
         file_path: str,
         analyzers: List[str],
         file_name: str,
-        tlp: str = "CLEAR"
+        tlp: str = "CLEAR",
+        reuse: bool = True
     ) -> int:
         """
         Submit file for analysis to IntelOwl using official pyintelowl SDK
@@ -187,17 +192,24 @@ class IntelOwlService(ConditionEvaluatorMixin):
             analyzers: List of analyzer names to run
             file_name: Original filename
             tlp: Traffic Light Protocol (CLEAR, GREEN, AMBER, RED)
+            reuse: Allow answering with a recent matching job (ANALYSIS_REUSE_MINUTES);
+                pass False when the caller may kill the job
         
         Returns:
             job_id: IntelOwl job identifier
         """
-        try:
+        def send_request() -> Dict[str, Any]:
             # Read file content as bytes
             with open(file_path, "rb") as f:
                 file_binary = f.read()
             
+            if reuse and settings.ANALYSIS_REUSE_MINUTES > 0:
+                existing = self._find_reusable_job(file_binary, analyzers)
+                if existing:
+                    return existing
+            
             # Use official pyintelowl SDK method
-            result = self.client.send_file_analysis_request(
+            return self.client.send_file_analysis_request(
                 filename=file_name,
                 binary=file_binary,
                 analyzers_requested=analyzers,
@@ -206,6 +218,12 @@ class IntelOwlService(ConditionEvaluatorMixin):
                 runtime_configuration={},
                 tags_labels=["threatflow"]
             )
+        
+        try:
+            # The SDK is synchronous; run it in the thread pool so concurrently
+            # scheduled stages do not stall the event loop while uploading
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, send_request)
             
             job_id = result["job_id"]
             logger.info(f"Analysis submitted to IntelOwl: Job ID {job_id} for analyzers {analyzers}")
@@ -218,11 +236,42 @@ class IntelOwlService(ConditionEvaluatorMixin):
             logger.error(f"Unexpected error during submission: {e}")
             raise
     
+    def _find_reusable_job(self, file_binary: bytes, analyzers: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a recent IntelOwl job for the same file and analyzers
+        
+        IntelOwl indexes analyses by MD5, so repeated submissions of one sample
+        (e.g. across a test session) reuse its reports instead of rescanning.
+        """
+        md5 = hashlib.md5(file_binary).hexdigest()
+        try:
+            existing = self.client.ask_analysis_availability(
+                md5=md5,
+                analyzers=analyzers,
+                minutes_ago=settings.ANALYSIS_REUSE_MINUTES
+            )
+        except IntelOwlClientException as e:
+            logger.debug(f"Availability lookup for {md5} failed, submitting new analysis: {e}")
+            return None
+        
+        if existing.get("job_id") and existing.get("status") in self.REUSABLE_JOB_STATUSES:
+            logger.info(f"Reusing IntelOwl job {existing['job_id']} ({existing['status']}) for analyzers {analyzers}")
+            return existing
+        return None
+    
+    def _kill_job(self, job_id: int) -> None:
+        """Best-effort kill of a running IntelOwl job (blocking SDK call)"""
+        try:
+            self.client.kill_running_job(job_id)
+        except IntelOwlClientException as e:
+            logger.warning(f"Could not kill job {job_id}: {e}")
+    
     async def get_job_status(self, job_id: int) -> Dict[str, Any]:
         """Get current status of an IntelOwl job using official SDK"""
         try:
-            # Use official pyintelowl SDK method
-            job = self.client.get_job_by_id(job_id)
+            # Use official pyintelowl SDK method (blocking, so off the event loop)
+            loop = asyncio.get_running_loop()
+            job = await loop.run_in_executor(None, self.client.get_job_by_id, job_id)
             
             # Convert to expected format for middleware compatibility
             status_dict = {
@@ -246,20 +295,37 @@ class IntelOwlService(ConditionEvaluatorMixin):
     async def wait_for_completion(
         self,
         job_id: int,
-        timeout: int = 300,
-        poll_interval: int = 5
+        timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        max_poll_interval: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Poll job until completion or timeout"""
-        max_attempts = timeout // poll_interval
+        """
+        Poll job until completion or timeout
         
-        for attempt in range(max_attempts):
+        The delay between polls starts at poll_interval and grows 1.5x per poll up
+        to max_poll_interval (defaults: POLL_INTERVAL, POLL_MAX_INTERVAL and
+        ANALYSIS_TIMEOUT from settings).
+        """
+        timeout = settings.ANALYSIS_TIMEOUT if timeout is None else timeout
+        delay = settings.POLL_INTERVAL if poll_interval is None else poll_interval
+        max_delay = settings.POLL_MAX_INTERVAL if max_poll_interval is None else max_poll_interval
+        
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + timeout
+        
+        while True:
             status_dict = await self.get_job_status(job_id)
             
             if status_dict["results"]:
-                logger.info(f"Job {job_id} completed after {attempt * poll_interval}s")
+                logger.info(f"Job {job_id} completed after {loop.time() - started:.1f}s")
                 return status_dict["results"]
             
-            await asyncio.sleep(poll_interval)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(max_delay, delay * 1.5)
         
         raise TimeoutError(f"Job {job_id} did not complete within {timeout}s")
     
@@ -276,10 +342,15 @@ class IntelOwlService(ConditionEvaluatorMixin):
             Dict with availability status
         """
         try:
-            result = self.client.ask_analysis_availability(
-                md5=md5,
-                analyzers=analyzers,
-                minutes_ago=minutes_ago
+            # Blocking SDK call; keep it off the event loop
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                None,
+                lambda: self.client.ask_analysis_availability(
+                    md5=md5,
+                    analyzers=analyzers,
+                    minutes_ago=minutes_ago
+                )
             )
             return result
         except IntelOwlClientException as e:
@@ -664,7 +735,8 @@ print(json.dumps(result))
         file_path: str,
         stages: List[Dict[str, Any]],
         file_name: str,
-        tlp: str = "CLEAR"
+        tlp: str = "CLEAR",
+        max_parallel: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Execute workflow with conditional logic (Phase 4)
@@ -674,6 +746,8 @@ print(json.dumps(result))
             stages: List of execution stages from parser
             file_name: Original filename
             tlp: Traffic Light Protocol
+            max_parallel: Max stages with a job in flight at once
+                (defaults to settings.MAX_PARALLEL_STAGES)
         
         Returns:
             {
@@ -687,19 +761,128 @@ print(json.dumps(result))
             }
         """
         all_results = {}
-        job_ids = []
+        job_by_stage = {}
         executed_stages = []
         skipped_stages = []
         
         logger.info(f"Starting conditional workflow execution with {len(stages)} total stages")
         
+        # Kahn-style scheduling: a stage waits only on the stages that produce
+        # its depends_on analyzer, so independent branches run concurrently
+        stage_by_id = {stage["stage_id"]: stage for stage in stages}
+        providers = {}
+        for stage in stages:
+            for analyzer in stage["analyzers"]:
+                providers.setdefault(analyzer, []).append(stage["stage_id"])
+        
+        parents = {
+            stage["stage_id"]: {
+                parent for parent in providers.get(stage.get("depends_on"), [])
+                if parent != stage["stage_id"]
+            }
+            for stage in stages
+        }
+        in_degree = {stage_id: len(parents[stage_id]) for stage_id in stage_by_id}
+        successors = {stage_id: [] for stage_id in stage_by_id}
+        for stage_id, stage_parents in parents.items():
+            for parent in stage_parents:
+                successors[parent].append(stage_id)
+        
+        skipped = set()
+        # Independent branches become ready together; bound how many submit and
+        # poll IntelOwl jobs at once so wide fan-outs don't flood the instance
+        slot_count = max(1, max_parallel or settings.MAX_PARALLEL_STAGES)
+        stage_slots = asyncio.Semaphore(slot_count)
+        # TRUE/FALSE stages of one conditional evaluate the same predicate on the
+        # same report; share that evaluation for the rest of this run
+        condition_cache = {}
+        # Reports by analyzer name per finished stage; conditions read them from
+        # their parent stages in plan order, so completion timing never decides
+        # which provider's report a branch sees
+        plan_order = {stage["stage_id"]: index for index, stage in enumerate(stages)}
+        reports_by_stage = {}
+        
+        # Stages on a hinted branch (expectedBranch) are submitted right away so
+        # IntelOwl runs them alongside their source analyzer; a mispredicted
+        # submission is killed once its condition evaluates false. Each holds a
+        # stage slot from submission until its stage finishes or is abandoned,
+        # and at most slot_count - 1 do so, leaving a slot for the stages they
+        # wait on. They never reuse a job, so a kill only hits jobs this run created.
+        speculative = {}
+        for stage in stages:
+            if len(speculative) >= slot_count - 1:
+                break
+            if stage.get("speculative") and stage["analyzers"] and stage.get("depends_on"):
+                await stage_slots.acquire()  # free: nothing else holds a slot yet
+                speculative[stage["stage_id"]] = asyncio.create_task(self.submit_file_analysis(
+                    file_path=file_path,
+                    analyzers=stage["analyzers"],
+                    file_name=file_name,
+                    tlp=tlp,
+                    reuse=False
+                ))
+        
+        # Sibling stages (same source analyzer, condition and parents) run or skip
+        # together; dispatch their analyzers as one IntelOwl job, not one per stage
+        batch_of = {}
+        batch_analyzers = {}
         for stage in stages:
+            stage_id = stage["stage_id"]
+            if not stage["analyzers"] or stage_id in speculative:
+                continue
+            key = json.dumps(
+                [stage.get("depends_on"), stage.get("condition"), sorted(parents[stage_id])],
+                sort_keys=True,
+                default=str
+            )
+            batch_of[stage_id] = key
+            batch_analyzers.setdefault(key, {}).update(dict.fromkeys(stage["analyzers"]))
+        batch_jobs = {}
+        
+        async def run_batch(key: str) -> Tuple[int, Dict[str, Any]]:
+            async with stage_slots:
+                job_id = await self.submit_file_analysis(
+                    file_path=file_path,
+                    analyzers=list(batch_analyzers[key]),
+                    file_name=file_name,
+                    tlp=tlp
+                )
+                return job_id, await self.wait_for_completion(job_id)
+        
+        async def abandon_speculation(stage_id: int) -> None:
+            submission = speculative.pop(stage_id, None)
+            if submission is None:
+                return
+            try:
+                job_id = await submission
+            except Exception as e:
+                logger.debug(f"Speculative submission for stage {stage_id} failed: {e}")
+                return
+            else:
+                logger.info(f"↩️  Stage {stage_id}: branch hint missed, killing speculative job {job_id}")
+                await asyncio.get_running_loop().run_in_executor(None, self._kill_job, job_id)
+            finally:
+                stage_slots.release()
+        
+        async def run_stage(stage: Dict[str, Any]) -> None:
             stage_id = stage["stage_id"]
             depends_on = stage.get("depends_on")
             condition = stage.get("condition")
             analyzers = stage["analyzers"]
             target_nodes = stage.get("target_nodes", [])
             
+            # Prune branches below a skipped stage: with its source analyzer never run,
+            # the condition could only hit the safe default (or its negation)
+            if parents[stage_id] and parents[stage_id] <= skipped:
+                logger.info(
+                    f"⏭️  Stage {stage_id}: PRUNED (no stage producing {depends_on} ran), "
+                    f"would have routed to {target_nodes}"
+                )
+                skipped.add(stage_id)
+                skipped_stages.append(stage_id)
+                await abandon_speculation(stage_id)
+                return
+            
             # Check if stage should execute
             if depends_on is None:
                 # Stage 0: Always execute
@@ -707,7 +890,11 @@ print(json.dumps(result))
                 logger.info(f"📋 Stage {stage_id}: Initial stage, executing analyzers={analyzers}")
             else:
                 # Conditional stage: evaluate condition
-                should_execute = self._evaluate_condition(condition, all_results)
+                reports = {}
+                for parent in sorted(parents[stage_id], key=plan_order.get):
+                    for name, report in reports_by_stage.get(parent, {}).items():
+                        reports.setdefault(name, report)
+                should_execute = self._evaluate_condition(condition, all_results, condition_cache, reports)
                 condition_desc = condition.get('type', 'unknown')
                 if condition.get('negate'):
                     condition_desc = f"NOT {condition_desc}"
@@ -716,52 +903,111 @@ print(json.dumps(result))
                     f"target_nodes={target_nodes}"
                 )
             
-            if should_execute:
-                # Check if stage has analyzers to execute
-                if not analyzers or len(analyzers) == 0:
-                    # Result-only stage (no analyzers, just routing to result nodes)
-                    logger.info(
-                        f"✅ Stage {stage_id}: Result-only (no analyzers), routing to {target_nodes}"
-                    )
-                    all_results[f"stage_{stage_id}"] = {
-                        "stage_id": stage_id,
-                        "type": "result_only",
-                        "target_nodes": target_nodes,
-                        "message": "Routing to result nodes based on condition"
-                    }
-                    executed_stages.append(stage_id)
-                    continue
-                
-                try:
-                    logger.info(f"▶️  Stage {stage_id}: Executing with analyzers={analyzers}")
-                    
-                    # Submit analysis
-                    job_id = await self.submit_file_analysis(
-                        file_path=file_path,
-                        analyzers=analyzers,
-                        file_name=file_name,
-                        tlp=tlp
-                    )
-                    
-                    job_ids.append(job_id)
-                    
-                    # Wait for completion
-                    stage_results = await self.wait_for_completion(job_id)
-                    all_results[f"stage_{stage_id}"] = stage_results
-                    executed_stages.append(stage_id)
-                    
-                    logger.info(f"✅ Stage {stage_id} completed successfully")
-                    
-                except Exception as e:
-                    logger.error(f"❌ Stage {stage_id} failed: {e}")
-                    all_results[f"stage_{stage_id}"] = {"error": str(e)}
-            else:
+            if not should_execute:
                 logger.info(
                     f"⏭️  Stage {stage_id}: SKIPPED (condition not met), "
                     f"would have routed to {target_nodes}"
                 )
+                skipped.add(stage_id)
                 skipped_stages.append(stage_id)
-                continue  # CRITICAL: Actually skip this stage
+                await abandon_speculation(stage_id)
+                return  # CRITICAL: Actually skip this stage
+            
+            # Check if stage has analyzers to execute
+            if not analyzers or len(analyzers) == 0:
+                # Result-only stage (no analyzers, just routing to result nodes)
+                logger.info(
+                    f"✅ Stage {stage_id}: Result-only (no analyzers), routing to {target_nodes}"
+                )
+                all_results[f"stage_{stage_id}"] = {
+                    "stage_id": stage_id,
+                    "type": "result_only",
+                    "target_nodes": target_nodes,
+                    "message": "Routing to result nodes based on condition"
+                }
+                executed_stages.append(stage_id)
+                return
+            
+            try:
+                submission = speculative.pop(stage_id, None)
+                if submission is not None:
+                    # A branch hint already submitted this stage (and holds its slot)
+                    try:
+                        job_id = await submission
+                        logger.info(f"🎯 Stage {stage_id}: branch hint hit, using speculative job {job_id}")
+                        job_by_stage[stage_id] = job_id
+                        stage_results = await self.wait_for_completion(job_id)
+                    finally:
+                        stage_slots.release()
+                else:
+                    key = batch_of[stage_id]
+                    batch = batch_jobs.get(key)
+                    if batch is None:
+                        logger.info(f"▶️  Stage {stage_id}: Executing with analyzers={list(batch_analyzers[key])}")
+                        batch = batch_jobs[key] = asyncio.ensure_future(run_batch(key))
+                    else:
+                        logger.info(f"🔗 Stage {stage_id}: Sharing job with sibling stage, analyzers={analyzers}")
+                    job_id, batch_results = await batch
+                    job_by_stage[stage_id] = job_id
+                    # The job ran every sibling's analyzers; keep only this stage's reports
+                    wanted = set(analyzers)
+                    stage_results = {
+                        **batch_results,
+                        "analyzer_reports": [
+                            report for report in batch_results.get("analyzer_reports") or []
+                            if report.get("name") in wanted
+                        ]
+                    }
+                all_results[f"stage_{stage_id}"] = stage_results
+                stage_reports = reports_by_stage[stage_id] = {}
+                for report in stage_results.get("analyzer_reports") or []:
+                    stage_reports.setdefault(report.get("name"), report)
+                executed_stages.append(stage_id)
+                
+                logger.info(f"✅ Stage {stage_id} completed successfully")
+                
+            except Exception as e:
+                logger.error(f"❌ Stage {stage_id} failed: {e}")
+                all_results[f"stage_{stage_id}"] = {"error": str(e)}
+        
+        pending = set(stage_by_id)
+        
+        async def run_and_release(tg: asyncio.TaskGroup, stage_id: int) -> None:
+            pending.discard(stage_id)
+            await run_stage(stage_by_id[stage_id])
+            # Skipped and failed stages still release their dependents; those under
+            # a skipped stage are pruned, those under a failed one evaluate as before
+            for child in successors[stage_id]:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    tg.create_task(run_and_release(tg, child))
+        
+        async with asyncio.TaskGroup() as tg:
+            for stage in stages:
+                if in_degree[stage["stage_id"]] == 0:
+                    tg.create_task(run_and_release(tg, stage["stage_id"]))
+        
+        # Stages caught in a dependency cycle never become ready; run them in plan order
+        for stage in stages:
+            if stage["stage_id"] in pending:
+                logger.warning(f"Stage {stage['stage_id']} has unresolved dependencies, running sequentially")
+                await run_stage(stage)
+        
+        for stage_id in list(speculative):
+            await abandon_speculation(stage_id)
+        
+        # Report in plan order regardless of completion order
+        order = {stage["stage_id"]: i for i, stage in enumerate(stages)}
+        executed_stages.sort(key=order.__getitem__)
+        skipped_stages.sort(key=order.__getitem__)
+        all_results = {
+            f"stage_{stage['stage_id']}": all_results[f"stage_{stage['stage_id']}"]
+            for stage in stages
+            if f"stage_{stage['stage_id']}" in all_results
+        }
+        job_ids = list(dict.fromkeys(
+            job_by_stage[stage["stage_id"]] for stage in stages if stage["stage_id"] in job_by_stage
+        ))
         
         return {
             "job_ids": job_ids,
@@ -774,7 +1020,9 @@ print(json.dumps(result))
     def _evaluate_condition(
         self,
         condition: Optional[Dict[str, Any]],
-        results: Dict[str, Any]
+        results: Dict[str, Any],
+        cache: Optional[Dict[Tuple[str, int], EvaluationResult]] = None,
+        reports: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> bool:
         """
         Evaluate condition with enterprise-grade error handling and recovery
@@ -784,6 +1032,13 @@ print(json.dumps(result))
         2. Schema Fallback: Use schema-defined patterns
         3. Generic Fallback: Pattern matching
         4. Safe Default: Conservative assumption
+        
+        Args:
+            condition: Stage condition from the parser
+            results: Stage results gathered so far
+            cache: Optional per-run memo of evaluations keyed by (condition, report)
+            reports: Optional index of the parent stages' reports by analyzer
+                name, used instead of scanning every stage's reports
         """
         if not condition:
             return True
@@ -796,7 +1051,7 @@ print(json.dumps(result))
             inner_condition = condition.get("inner")
             if inner_condition:
                 # Evaluate inner condition and negate result
-                inner_result = self._evaluate_condition(inner_condition, results)
+                inner_result = self._evaluate_condition(inner_condition, results, cache, reports)
                 logger.debug(f"NOT condition: inner={inner_result}, result={not inner_result}")
                 return not inner_result
             else:
@@ -804,7 +1059,7 @@ print(json.dumps(result))
                 return False
         
         # Evaluate the condition
-        eval_result = self._evaluate_with_recovery(condition, results)
+        eval_result = self._evaluate_with_recovery(condition, results, cache, reports)
         
         # Log evaluation details
         if eval_result.confidence < 1.0:
@@ -824,7 +1079,9 @@ print(json.dumps(result))
     def _evaluate_with_recovery(
         self,
         condition: Dict[str, Any],
-        results: Dict[str, Any]
+        results: Dict[str, Any],
+        cache: Optional[Dict[Tuple[str, int], EvaluationResult]] = None,
+        reports: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> EvaluationResult:
         """
         Evaluate condition with multiple fallback strategies
@@ -847,7 +1104,7 @@ print(json.dumps(result))
         # Handle NOT condition
         if cond_type == "NOT":
             inner_condition = condition.get("inner")
-            inner_result = self._evaluate_with_recovery(inner_condition, results)
+            inner_result = self._evaluate_with_recovery(inner_condition, results, cache, reports)
             return EvaluationResult(
                 result=not inner_result.result,
                 confidence=inner_result.confidence,
@@ -857,7 +1114,10 @@ print(json.dumps(result))
             )
         
         # Find analyzer results
-        analyzer_report = self._find_analyzer_report(source_analyzer, results)
+        if reports is not None:
+            analyzer_report = reports.get(source_analyzer)
+        else:
+            analyzer_report = self._find_analyzer_report(source_analyzer, results)
         
         if not analyzer_report:
             logger.warning(f"Analyzer {source_analyzer} results not found")
@@ -869,6 +1129,25 @@ print(json.dumps(result))
                 evaluation_path="analyzer_not_found"
             )
         
+        if cache is None:
+            return self._evaluate_report(condition, analyzer_report, errors)
+        
+        # negate is applied by the caller, so both branches of a conditional share a key
+        cache_key = (
+            json.dumps({k: v for k, v in condition.items() if k != "negate"}, sort_keys=True, default=str),
+            id(analyzer_report)
+        )
+        if cache_key not in cache:
+            cache[cache_key] = self._evaluate_report(condition, analyzer_report, errors)
+        return cache[cache_key]
+    
+    def _evaluate_report(
+        self,
+        condition: Dict[str, Any],
+        analyzer_report: Dict[str, Any],
+        errors: List[str]
+    ) -> EvaluationResult:
+        """Run the evaluation strategies against a located analyzer report"""
         # Strategy 1: PRIMARY - Direct evaluation
         try:
             result = self._evaluate_primary(condition, analyzer_report)
@@ -936,213 +1215,241 @@ print(json.dumps(result))
         
         UPDATED: Based on actual IntelOwl analyzer responses from comprehensive testing.
         Field paths are verified against real response data.
+        
+        Condition types are resolved to their predicate through _PRIMARY_PREDICATES,
+        built once when the class is defined, instead of an if/elif chain per call.
         """
         cond_type = condition.get("type")
-        report_data = analyzer_report.get("report", {})
-        analyzer_name = analyzer_report.get("name", "")
+        predicate = self._PRIMARY_PREDICATES.get(cond_type)
         
-        # Verdict-based conditions
-        if cond_type == "verdict_malicious":
-            return self._check_malicious(analyzer_name, report_data, analyzer_report)
+        if predicate is None:
+            # Unknown condition type
+            raise ValueError(f"Unknown condition type: {cond_type}")
         
-        elif cond_type == "verdict_suspicious":
-            return self._check_suspicious(analyzer_name, report_data, analyzer_report)
+        report_data = analyzer_report.get("report", {})
+        analyzer_name = analyzer_report.get("name", "")
+        return predicate(self, condition, analyzer_report, report_data, analyzer_name)
+    
+    # Verdict-based conditions
+    
+    def _primary_verdict_malicious(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        return self._check_malicious(analyzer_name, report_data, analyzer_report)
+    
+    def _primary_verdict_suspicious(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        return self._check_suspicious(analyzer_name, report_data, analyzer_report)
+    
+    def _primary_verdict_clean(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        return self._check_clean(analyzer_name, report_data, analyzer_report)
+    
+    def _primary_analyzer_success(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        status = analyzer_report.get("status")
+        return status == "SUCCESS"
+    
+    def _primary_analyzer_failed(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        status = analyzer_report.get("status")
+        return status != "SUCCESS"
+    
+    # Field-based conditions
+    
+    def _primary_field_compare(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        cond_type = condition.get("type")
+        field_path = condition.get("field_path", "")
+        expected_value = condition.get("expected_value")
         
-        elif cond_type == "verdict_clean":
-            return self._check_clean(analyzer_name, report_data, analyzer_report)
+        if not field_path or expected_value is None:
+            raise ValueError(f"Field path or expected value missing for {cond_type}")
         
-        elif cond_type == "analyzer_success":
-            status = analyzer_report.get("status")
-            return status == "SUCCESS"
+        # Navigate JSON path using mixin method
+        current = self._navigate_field_path(report_data, field_path)
         
-        elif cond_type == "analyzer_failed":
-            status = analyzer_report.get("status")
-            return status != "SUCCESS"
+        if current is None:
+            raise ValueError(f"Field path '{field_path}' not found in report")
         
-        # Field-based conditions
-        elif cond_type in ["field_equals", "field_contains", "field_greater_than", "field_less_than"]:
-            field_path = condition.get("field_path", "")
-            expected_value = condition.get("expected_value")
-            
-            if not field_path or expected_value is None:
-                raise ValueError(f"Field path or expected value missing for {cond_type}")
-            
-            # Navigate JSON path using mixin method
-            current = self._navigate_field_path(report_data, field_path)
-            
-            if current is None:
-                raise ValueError(f"Field path '{field_path}' not found in report")
-            
-            if cond_type == "field_equals":
-                result = current == expected_value
-                logger.debug(f"field_equals: {current} == {expected_value} -> {result}")
+        if cond_type == "field_equals":
+            result = current == expected_value
+            logger.debug(f"field_equals: {current} == {expected_value} -> {result}")
+            return result
+        elif cond_type == "field_contains":
+            result = self._check_contains(current, expected_value)
+            logger.debug(f"field_contains: '{expected_value}' in '{current}' -> {result}")
+            return result
+        elif cond_type == "field_greater_than":
+            try:
+                result = float(current) > float(expected_value)
+                logger.debug(f"field_greater_than: {current} > {expected_value} -> {result}")
                 return result
-            elif cond_type == "field_contains":
-                result = self._check_contains(current, expected_value)
-                logger.debug(f"field_contains: '{expected_value}' in '{current}' -> {result}")
+            except (ValueError, TypeError):
+                raise ValueError(f"Cannot compare {current} > {expected_value}")
+        else:  # field_less_than
+            try:
+                result = float(current) < float(expected_value)
+                logger.debug(f"field_less_than: {current} < {expected_value} -> {result}")
                 return result
-            elif cond_type == "field_greater_than":
-                try:
-                    result = float(current) > float(expected_value)
-                    logger.debug(f"field_greater_than: {current} > {expected_value} -> {result}")
-                    return result
-                except (ValueError, TypeError):
-                    raise ValueError(f"Cannot compare {current} > {expected_value}")
-            elif cond_type == "field_less_than":
-                try:
-                    result = float(current) < float(expected_value)
-                    logger.debug(f"field_less_than: {current} < {expected_value} -> {result}")
-                    return result
-                except (ValueError, TypeError):
-                    raise ValueError(f"Cannot compare {current} < {expected_value}")
-        
-        elif cond_type == "yara_rule_match":
-            # Check if YARA analyzer found matches
-            # Real response: Multiple rule set fields, each containing array of matches
-            # Also check data_model.signatures
-            
-            # Check data_model.signatures first (from job level)
+            except (ValueError, TypeError):
+                raise ValueError(f"Cannot compare {current} < {expected_value}")
+    
+    def _primary_yara_rule_match(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        # Check if YARA analyzer found matches
+        # Real response: Multiple rule set fields, each containing array of matches
+        # Also check data_model.signatures
+        
+        # Check data_model.signatures first (from job level)
+        job_data_model = analyzer_report.get("data_model", {})
+        signatures = job_data_model.get("signatures", [])
+        if isinstance(signatures, list) and len(signatures) > 0:
+            logger.debug(f"YARA data_model.signatures: {len(signatures)} matches -> True")
+            return True
+        
+        # Check individual rule set fields
+        yara_rule_sets = [
+            "yara-rules_rules", "elastic_protections-artifacts",
+            "advanced-threat-research_yara-rules", "neo23x0_signature-base",
+            "bartblaze_yara-rules", "intezer_yara-rules", "inquest_yara-rules"
+        ]
+        
+        for rule_set in yara_rule_sets:
+            matches = report_data.get(rule_set, [])
+            if isinstance(matches, list) and len(matches) > 0:
+                # Filter out utility rules
+                for match in matches:
+                    rule_path = match.get("path", "") if isinstance(match, dict) else ""
+                    if "utils/" not in rule_path:
+                        logger.debug(f"YARA {rule_set} match found -> True")
+                        return True
+        
+        logger.debug("No significant YARA matches found -> False")
+        return False
+    
+    def _primary_capability_detected(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        # Check if analyzer detected specific capabilities
+        capabilities = report_data.get("capabilities", [])
+        expected_capability = condition.get("expected_value", "")
+        if isinstance(capabilities, list):
+            result = expected_capability in capabilities
+            logger.debug(f"capability_detected: '{expected_capability}' in {capabilities} -> {result}")
+            return result
+        logger.debug(f"capabilities field not found or not a list: {capabilities}")
+        return False
+    
+    def _primary_has_detections(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        # Check if analyzer has any detections
+        # Use analyzer-specific detection fields based on real responses
+        analyzer_lower = analyzer_name.lower() if analyzer_name else ""
+        
+        # ClamAV: report.detections[]
+        if analyzer_lower == "clamav":
+            detections = report_data.get("detections", [])
+            has_det = isinstance(detections, list) and len(detections) > 0
+            logger.debug(f"ClamAV has_detections: {has_det}")
+            return has_det
+        
+        # Yara: Check data_model.signatures and rule set fields
+        if analyzer_lower == "yara":
             job_data_model = analyzer_report.get("data_model", {})
             signatures = job_data_model.get("signatures", [])
             if isinstance(signatures, list) and len(signatures) > 0:
-                logger.debug(f"YARA data_model.signatures: {len(signatures)} matches -> True")
+                logger.debug(f"Yara has_detections via signatures: True")
                 return True
-            
-            # Check individual rule set fields
-            yara_rule_sets = [
-                "yara-rules_rules", "elastic_protections-artifacts",
-                "advanced-threat-research_yara-rules", "neo23x0_signature-base",
-                "bartblaze_yara-rules", "intezer_yara-rules", "inquest_yara-rules"
-            ]
-            
-            for rule_set in yara_rule_sets:
-                matches = report_data.get(rule_set, [])
-                if isinstance(matches, list) and len(matches) > 0:
-                    # Filter out utility rules
-                    for match in matches:
-                        rule_path = match.get("path", "") if isinstance(match, dict) else ""
-                        if "utils/" not in rule_path:
-                            logger.debug(f"YARA {rule_set} match found -> True")
-                            return True
-            
-            logger.debug("No significant YARA matches found -> False")
+            # Check rule sets
+            for key, value in report_data.items():
+                if isinstance(value, list) and len(value) > 0:
+                    logger.debug(f"Yara has_detections via {key}: True")
+                    return True
             return False
         
-        elif cond_type == "capability_detected":
-            # Check if analyzer detected specific capabilities
-            capabilities = report_data.get("capabilities", [])
-            expected_capability = condition.get("expected_value", "")
-            if isinstance(capabilities, list):
-                result = expected_capability in capabilities
-                logger.debug(f"capability_detected: '{expected_capability}' in {capabilities} -> {result}")
-                return result
-            logger.debug(f"capabilities field not found or not a list: {capabilities}")
-            return False
+        # Doc_Info: mraptor != "ok"
+        if analyzer_lower == "doc_info":
+            mraptor = report_data.get("mraptor", "")
+            has_det = mraptor != "ok" and mraptor != ""
+            logger.debug(f"Doc_Info has_detections (mraptor={mraptor}): {has_det}")
+            return has_det
         
-        elif cond_type == "has_detections":
-            # Check if analyzer has any detections
-            # Use analyzer-specific detection fields based on real responses
-            analyzer_lower = analyzer_name.lower() if analyzer_name else ""
-            
-            # ClamAV: report.detections[]
-            if analyzer_lower == "clamav":
-                detections = report_data.get("detections", [])
-                has_det = isinstance(detections, list) and len(detections) > 0
-                logger.debug(f"ClamAV has_detections: {has_det}")
-                return has_det
-            
-            # Yara: Check data_model.signatures and rule set fields
-            if analyzer_lower == "yara":
-                job_data_model = analyzer_report.get("data_model", {})
-                signatures = job_data_model.get("signatures", [])
-                if isinstance(signatures, list) and len(signatures) > 0:
-                    logger.debug(f"Yara has_detections via signatures: True")
-                    return True
-                # Check rule sets
-                for key, value in report_data.items():
-                    if isinstance(value, list) and len(value) > 0:
-                        logger.debug(f"Yara has_detections via {key}: True")
-                        return True
-                return False
-            
-            # Doc_Info: mraptor != "ok"
-            if analyzer_lower == "doc_info":
-                mraptor = report_data.get("mraptor", "")
-                has_det = mraptor != "ok" and mraptor != ""
-                logger.debug(f"Doc_Info has_detections (mraptor={mraptor}): {has_det}")
-                return has_det
-            
-            # Quark_Engine: crimes[] or score > 0
-            if analyzer_lower == "quark_engine":
-                crimes = report_data.get("crimes", [])
-                score = report_data.get("total_score", 0)
-                has_det = (isinstance(crimes, list) and len(crimes) > 0) or score > 0
-                logger.debug(f"Quark_Engine has_detections: {has_det}")
-                return has_det
-            
-            # APK_Artifacts: permissions[] (any permission counts as detection)
-            if analyzer_lower == "apk_artifacts":
-                permissions = report_data.get("permission", [])
-                has_det = isinstance(permissions, list) and len(permissions) > 0
-                logger.debug(f"APK_Artifacts has_detections (permissions): {has_det}")
-                return has_det
-            
-            # Rtf_Info: ole_objects[] or follina[]
-            if analyzer_lower == "rtf_info":
-                rtfobj = report_data.get("rtfobj", {})
-                ole_objects = rtfobj.get("ole_objects", []) if isinstance(rtfobj, dict) else []
-                follina = report_data.get("follina", [])
-                has_det = (isinstance(ole_objects, list) and len(ole_objects) > 0) or \
-                          (isinstance(follina, list) and len(follina) > 0)
-                logger.debug(f"Rtf_Info has_detections: {has_det}")
-                return has_det
-            
-            # BoxJS: IOC.json[]
-            if analyzer_lower == "boxjs":
-                ioc = report_data.get("IOC.json", [])
-                has_det = isinstance(ioc, list) and len(ioc) > 0
-                logger.debug(f"BoxJS has_detections: {has_det}")
-                return has_det
-            
-            # APKiD: files[]
-            if analyzer_lower == "apkid":
-                files = report_data.get("files", [])
-                has_det = isinstance(files, list) and len(files) > 0
-                logger.debug(f"APKiD has_detections: {has_det}")
-                return has_det
-            
-            # Generic fallback: check common detection fields
-            detection_fields = ["detections", "signatures", "rules", "alerts", "threats", "matches", "crimes"]
-            for field in detection_fields:
-                if field in report_data:
-                    value = report_data[field]
-                    if isinstance(value, list) and len(value) > 0:
-                        logger.debug(f"Generic has_detections via {field}: True")
-                        return True
-            
-            logger.debug(f"has_detections: No detections found -> False")
-            return False
+        # Quark_Engine: crimes[] or score > 0
+        if analyzer_lower == "quark_engine":
+            crimes = report_data.get("crimes", [])
+            score = report_data.get("total_score", 0)
+            has_det = (isinstance(crimes, list) and len(crimes) > 0) or score > 0
+            logger.debug(f"Quark_Engine has_detections: {has_det}")
+            return has_det
         
-        elif cond_type == "has_errors":
-            # Check if analyzer report contains errors
-            errors = report_data.get("errors", [])
-            if isinstance(errors, list) and len(errors) > 0:
-                logger.debug(f"Errors found: {errors} -> True")
-                return True
-            logger.debug("No errors found -> False")
-            return False
+        # APK_Artifacts: permissions[] (any permission counts as detection)
+        if analyzer_lower == "apk_artifacts":
+            permissions = report_data.get("permission", [])
+            has_det = isinstance(permissions, list) and len(permissions) > 0
+            logger.debug(f"APK_Artifacts has_detections (permissions): {has_det}")
+            return has_det
         
-        elif cond_type == "custom_field":
-            # Legacy support for custom field conditions
-            field_path = condition.get("field_path", "")
-            expected_value = condition.get("expected_value")
-            
-            # Navigate JSON path using mixin method
-            current = self._navigate_field_path(report_data, field_path)
-            return current == expected_value
+        # Rtf_Info: ole_objects[] or follina[]
+        if analyzer_lower == "rtf_info":
+            rtfobj = report_data.get("rtfobj", {})
+            ole_objects = rtfobj.get("ole_objects", []) if isinstance(rtfobj, dict) else []
+            follina = report_data.get("follina", [])
+            has_det = (isinstance(ole_objects, list) and len(ole_objects) > 0) or \
+                      (isinstance(follina, list) and len(follina) > 0)
+            logger.debug(f"Rtf_Info has_detections: {has_det}")
+            return has_det
         
-        # Unknown condition type
-        raise ValueError(f"Unknown condition type: {cond_type}")
+        # BoxJS: IOC.json[]
+        if analyzer_lower == "boxjs":
+            ioc = report_data.get("IOC.json", [])
+            has_det = isinstance(ioc, list) and len(ioc) > 0
+            logger.debug(f"BoxJS has_detections: {has_det}")
+            return has_det
+        
+        # APKiD: files[]
+        if analyzer_lower == "apkid":
+            files = report_data.get("files", [])
+            has_det = isinstance(files, list) and len(files) > 0
+            logger.debug(f"APKiD has_detections: {has_det}")
+            return has_det
+        
+        # Generic fallback: check common detection fields
+        detection_fields = ["detections", "signatures", "rules", "alerts", "threats", "matches", "crimes"]
+        for field in detection_fields:
+            if field in report_data:
+                value = report_data[field]
+                if isinstance(value, list) and len(value) > 0:
+                    logger.debug(f"Generic has_detections via {field}: True")
+                    return True
+        
+        logger.debug(f"has_detections: No detections found -> False")
+        return False
+    
+    def _primary_has_errors(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        # Check if analyzer report contains errors
+        errors = report_data.get("errors", [])
+        if isinstance(errors, list) and len(errors) > 0:
+            logger.debug(f"Errors found: {errors} -> True")
+            return True
+        logger.debug("No errors found -> False")
+        return False
+    
+    def _primary_custom_field(self, condition, analyzer_report, report_data, analyzer_name) -> bool:
+        # Legacy support for custom field conditions
+        field_path = condition.get("field_path", "")
+        expected_value = condition.get("expected_value")
+        
+        # Navigate JSON path using mixin method
+        current = self._navigate_field_path(report_data, field_path)
+        return current == expected_value
+    
+    # Condition type -> primary predicate, resolved once at class definition
+    _PRIMARY_PREDICATES = {
+        "verdict_malicious": _primary_verdict_malicious,
+        "verdict_suspicious": _primary_verdict_suspicious,
+        "verdict_clean": _primary_verdict_clean,
+        "analyzer_success": _primary_analyzer_success,
+        "analyzer_failed": _primary_analyzer_failed,
+        "field_equals": _primary_field_compare,
+        "field_contains": _primary_field_compare,
+        "field_greater_than": _primary_field_compare,
+        "field_less_than": _primary_field_compare,
+        "yara_rule_match": _primary_yara_rule_match,
+        "capability_detected": _primary_capability_detected,
+        "has_detections": _primary_has_detections,
+        "has_errors": _primary_has_errors,
+        "custom_field": _primary_custom_field,
+    }
     
     def _check_malicious(self, analyzer_name: str, report_data: Dict[str, Any], analyzer_report: Dict[str, Any]) -> bool:
         """
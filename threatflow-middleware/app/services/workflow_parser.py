@@ -3,19 +3,68 @@ Enhanced workflow parser with conditional logic support (Phase 4)
 Converts React Flow JSON to multi-stage IntelOwl execution plan
 """
 
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
+from collections import OrderedDict
 from app.models.workflow import WorkflowNode, WorkflowEdge, NodeType, ConditionType
+import copy
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Parsed plans kept for resubmissions of the same workflow (e.g. one topology, many files)
+PLAN_CACHE_SIZE = 128
+
 class WorkflowParser:
     """
     Translates visual workflow (nodes + edges) into executable plan
     Now supports conditional logic and multi-stage execution
     """
     
+    def __init__(self):
+        self._plan_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    
     def parse(self, nodes: List[WorkflowNode], edges: List[WorkflowEdge]) -> Dict[str, Any]:
+        """
+        Parse workflow into an execution plan, reusing the plan of an identical workflow
+        
+        Node positions and edge IDs do not affect the plan and are left out of the
+        cache key. Callers get their own copy, so a cached plan is never mutated.
+        """
+        key = self._plan_key(nodes, edges)
+        plan = self._plan_cache.get(key)
+        
+        if plan is None:
+            plan = self._parse(nodes, edges)
+            self._plan_cache[key] = plan
+            if len(self._plan_cache) > PLAN_CACHE_SIZE:
+                self._plan_cache.popitem(last=False)
+        else:
+            self._plan_cache.move_to_end(key)
+            logger.debug(f"Reusing cached execution plan ({len(plan['stages'])} stages)")
+        
+        return copy.deepcopy(plan)
+    
+    def _plan_key(self, nodes: List[WorkflowNode], edges: List[WorkflowEdge]) -> str:
+        """Serialize the parts of a workflow that determine its execution plan"""
+        return json.dumps(
+            [
+                [
+                    [
+                        node.id,
+                        node.type.value,
+                        node.data,
+                        node.conditional_data.model_dump(mode="json") if node.conditional_data else None
+                    ]
+                    for node in nodes
+                ],
+                [[edge.source, edge.target, edge.sourceHandle, edge.targetHandle] for edge in edges]
+            ],
+            sort_keys=True,
+            default=str
+        )
+    
+    def _parse(self, nodes: List[WorkflowNode], edges: List[WorkflowEdge]) -> Dict[str, Any]:
         """
         Parse workflow and generate execution plan with stages
         
@@ -45,6 +94,9 @@ class WorkflowParser:
                             "source_analyzer": "ClamAV"
                         }
                     }
+                ],
+                "stage_routing": [
+                    {"stage_id": 0, "target_nodes": [...], "executed": False, "analyzers": [...]}
                 ]
             }
         """
@@ -66,12 +118,24 @@ class WorkflowParser:
         
         if not has_conditionals:
             # Simple linear workflow (Phase 3 behavior)
-            return self._parse_linear_workflow(file_node, nodes, edges, node_map, edge_map)
+            plan = self._parse_linear_workflow(file_node, nodes, edges, node_map, edge_map)
+        else:
+            # Complex workflow with conditionals (Phase 4)
+            plan = self._parse_conditional_workflow(
+                file_node, nodes, edges, node_map, edge_map, conditional_nodes
+            )
         
-        # Complex workflow with conditionals (Phase 4)
-        return self._parse_conditional_workflow(
-            file_node, nodes, edges, node_map, edge_map, conditional_nodes
-        )
+        # Routing metadata is static per topology; only "executed" is filled in at run time
+        plan["stage_routing"] = [
+            {
+                "stage_id": stage["stage_id"],
+                "target_nodes": stage.get("target_nodes", []),
+                "executed": False,
+                "analyzers": stage.get("analyzers", [])
+            }
+            for stage in plan["stages"]
+        ]
+        return plan
     
     def _parse_linear_workflow(
         self,
@@ -150,6 +214,19 @@ class WorkflowParser:
         )
         stages.extend(conditional_stages)
         
+        # Chained conditionals are reached both as top-level conditionals and through
+        # their parent branch; collapse structurally identical stages so the same
+        # analyzers are not submitted twice under the same condition
+        unique_stages = {}
+        for stage in stages:
+            stage_key = json.dumps(
+                [stage["analyzers"], stage["depends_on"], stage["condition"], sorted(stage["target_nodes"])],
+                sort_keys=True,
+                default=str
+            )
+            unique_stages.setdefault(stage_key, stage)
+        stages = list(unique_stages.values())
+        
         # Assign temporary unique IDs for dependency ordering
         for i, stage in enumerate(stages):
             if stage["stage_id"] == -1:
@@ -181,10 +258,18 @@ class WorkflowParser:
         """Build stages for conditional branches, handling chained conditionals recursively"""
         stages = []
         
+        # Index edges and analyzer nodes once instead of rescanning them per conditional
+        outgoing, incoming = self._build_edge_index(edges)
+        analyzer_node_ids = self._build_analyzer_node_index(node_map)
+        first_analyzer_node = {}
+        for node in node_map.values():
+            if node.type == NodeType.ANALYZER and node.data.get("analyzer"):
+                first_analyzer_node.setdefault(node.data["analyzer"], node)
+        
         # Process each top-level conditional
         for cond_node in conditional_nodes:
             # Find input analyzer
-            input_edges = [e for e in edges if e.target == cond_node.id]
+            input_edges = incoming.get(cond_node.id, [])
             if not input_edges:
                 continue
                 
@@ -198,9 +283,10 @@ class WorkflowParser:
             
             # Get condition configuration
             condition_config = self._extract_condition_config(cond_node, source_analyzer)
+            hinted_branch = self._hinted_branch(cond_node)
             
             # Process TRUE and FALSE branches
-            output_edges = [e for e in edges if e.source == cond_node.id]
+            output_edges = outgoing.get(cond_node.id, [])
             
             for is_true_branch in [True, False]:
                 branch_analyzers = []
@@ -229,9 +315,13 @@ class WorkflowParser:
                     elif target_node.type == NodeType.RESULT and branch_type:
                         branch_result_nodes.append(edge.target)
                 
+                # Several nodes of one analyzer on a branch collapse into a single run (and a
+                # single walk of its downstream conditionals)
+                branch_analyzers = list(dict.fromkeys(branch_analyzers))
+                
                 # Find result nodes connected to the analyzers in this branch
                 analyzer_result_nodes = self._find_result_nodes_for_analyzers(
-                    branch_analyzers, node_map, edges
+                    branch_analyzers, analyzer_node_ids, node_map, outgoing
                 )
                 branch_result_nodes.extend(analyzer_result_nodes)
                 branch_result_nodes = list(set(branch_result_nodes))  # Remove duplicates
@@ -259,6 +349,8 @@ class WorkflowParser:
                         "target_nodes": branch_result_nodes,
                         "description": f"Conditional branch: {branch_condition.get('type', 'unknown')} {'(negated)' if not is_true_branch else ''}"
                     }
+                    if hinted_branch is is_true_branch:
+                        stage["speculative"] = True
                     stages.append(stage)
                     
                     # Mark analyzers as processed
@@ -267,26 +359,21 @@ class WorkflowParser:
                     
                     # Check if any of these analyzers lead to more conditionals
                     for analyzer in branch_analyzers:
-                        analyzer_node = None
-                        for node in node_map.values():
-                            if node.type == NodeType.ANALYZER and node.data.get("analyzer") == analyzer:
-                                analyzer_node = node
-                                break
+                        analyzer_node = first_analyzer_node.get(analyzer)
                         
                         if analyzer_node:
                             # Find conditionals that depend on this analyzer
                             downstream_conditionals = []
-                            for edge in edges:
-                                if edge.source == analyzer_node.id:
-                                    target_node = node_map.get(edge.target)
-                                    if target_node and target_node.type == NodeType.CONDITIONAL:
-                                        downstream_conditionals.append(target_node)
+                            for edge in outgoing.get(analyzer_node.id, []):
+                                target_node = node_map.get(edge.target)
+                                if target_node and target_node.type == NodeType.CONDITIONAL:
+                                    downstream_conditionals.append(target_node)
                             
                             # Recursively process downstream conditionals
                             for downstream_cond in downstream_conditionals:
                                 self._process_downstream_conditional(
-                                    downstream_cond, analyzer, node_map, edges, 
-                                    processed_nodes, stages, [cond_node.id]
+                                    downstream_cond, analyzer, node_map, outgoing,
+                                    analyzer_node_ids, processed_nodes, stages, [cond_node.id]
                                 )
         
         return stages
@@ -296,7 +383,8 @@ class WorkflowParser:
         cond_node: WorkflowNode,
         source_analyzer: str,
         node_map: Dict[str, WorkflowNode],
-        edges: List[WorkflowEdge],
+        outgoing: Dict[str, List[WorkflowEdge]],
+        analyzer_node_ids: Dict[str, str],
         processed_nodes: set,
         stages: List[Dict[str, Any]],
         current_path: List[str]
@@ -308,9 +396,10 @@ class WorkflowParser:
         
         # Get condition configuration
         condition_config = self._extract_condition_config(cond_node, source_analyzer)
+        hinted_branch = self._hinted_branch(cond_node)
         
         # Process branches for this downstream conditional
-        output_edges = [e for e in edges if e.source == cond_node.id]
+        output_edges = outgoing.get(cond_node.id, [])
         
         for is_true_branch in [True, False]:
             branch_analyzers = []
@@ -335,9 +424,13 @@ class WorkflowParser:
                 elif target_node.type == NodeType.RESULT and branch_type:
                     branch_result_nodes.append(edge.target)
             
+            # Several nodes of one analyzer on a branch collapse into a single run (and a
+            # single walk of its downstream conditionals)
+            branch_analyzers = list(dict.fromkeys(branch_analyzers))
+            
             # Find result nodes connected to the analyzers in this branch
             analyzer_result_nodes = self._find_result_nodes_for_analyzers(
-                branch_analyzers, node_map, edges
+                branch_analyzers, analyzer_node_ids, node_map, outgoing
             )
             branch_result_nodes.extend(analyzer_result_nodes)
             branch_result_nodes = list(set(branch_result_nodes))  # Remove duplicates
@@ -365,6 +458,8 @@ class WorkflowParser:
                     "target_nodes": branch_result_nodes,
                     "description": f"Chained conditional branch: {branch_condition.get('type', 'unknown')}"
                 }
+                if hinted_branch is is_true_branch:
+                    stage["speculative"] = True
                 stages.append(stage)
                 
                 # Mark analyzers as processed
@@ -405,6 +500,18 @@ class WorkflowParser:
         
         return condition_config
     
+    def _hinted_branch(self, cond_node: WorkflowNode) -> Optional[bool]:
+        """
+        Branch the conditional is expected to take ("expectedBranch": "true"/"false")
+        
+        Only an optimization hint: the hinted branch is marked speculative and may
+        be submitted before its condition is known. Routing is unaffected.
+        """
+        hint = cond_node.data.get("expectedBranch")
+        if hint in ("true", "false"):
+            return hint == "true"
+        return None
+    
     def _order_stages_by_dependencies(self, stages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Order stages by their dependencies to ensure proper execution sequence"""
         if not stages:
@@ -465,6 +572,28 @@ class WorkflowParser:
             edge_map[edge.source].append(edge.target)
         return edge_map
     
+    def _build_edge_index(
+        self,
+        edges: List[WorkflowEdge]
+    ) -> Tuple[Dict[str, List[WorkflowEdge]], Dict[str, List[WorkflowEdge]]]:
+        """Build outgoing and incoming edge lists per node in one pass"""
+        outgoing: Dict[str, List[WorkflowEdge]] = {}
+        incoming: Dict[str, List[WorkflowEdge]] = {}
+        for edge in edges:
+            outgoing.setdefault(edge.source, []).append(edge)
+            incoming.setdefault(edge.target, []).append(edge)
+        return outgoing, incoming
+    
+    def _build_analyzer_node_index(self, node_map: Dict[str, WorkflowNode]) -> Dict[str, str]:
+        """Map analyzer names to node IDs (the last node wins for duplicate analyzers)"""
+        analyzer_node_ids = {}
+        for node in node_map.values():
+            if node.type == NodeType.ANALYZER:
+                analyzer_name = node.data.get("analyzer")
+                if analyzer_name:
+                    analyzer_node_ids[analyzer_name] = node.id
+        return analyzer_node_ids
+    
     def _get_direct_analyzers(
         self, 
         source_id: str, 
@@ -563,26 +692,19 @@ class WorkflowParser:
     def _find_result_nodes_for_analyzers(
         self,
         analyzer_names: List[str],
+        analyzer_node_ids: Dict[str, str],
         node_map: Dict[str, WorkflowNode],
-        edges: List[WorkflowEdge]
+        outgoing: Dict[str, List[WorkflowEdge]]
     ) -> List[str]:
         """Find result nodes that are reachable from the given analyzers (recursively)"""
         result_nodes = []
         
-        # Create a map of analyzer names to node IDs
-        analyzer_node_map = {}
-        for node in node_map.values():
-            if node.type == NodeType.ANALYZER:
-                analyzer_name = node.data.get("analyzer")
-                if analyzer_name:
-                    analyzer_node_map[analyzer_name] = node.id
-        
         # For each analyzer, find all reachable result nodes
         for analyzer_name in analyzer_names:
-            analyzer_node_id = analyzer_node_map.get(analyzer_name)
+            analyzer_node_id = analyzer_node_ids.get(analyzer_name)
             if analyzer_node_id:
                 reachable = self._find_all_reachable_result_nodes(
-                    analyzer_node_id, edges, node_map
+                    analyzer_node_id, outgoing, node_map
                 )
                 result_nodes.extend(reachable)
         
@@ -591,7 +713,7 @@ class WorkflowParser:
     def _find_all_reachable_result_nodes(
         self,
         start_node_id: str,
-        edges: List[WorkflowEdge],
+        outgoing: Dict[str, List[WorkflowEdge]],
         node_map: Dict[str, WorkflowNode],
         visited: Optional[Set[str]] = None
     ) -> List[str]:
@@ -603,7 +725,7 @@ class WorkflowParser:
         
         Args:
             start_node_id: Starting node ID for traversal
-            edges: List of workflow edges
+            outgoing: Outgoing edges per node ID
             node_map: Map of node IDs to nodes
             visited: Set of already visited nodes (to prevent cycles)
         
@@ -629,13 +751,13 @@ class WorkflowParser:
         
         # Recurse through all outgoing edges
         result_nodes = []
-        outgoing_edges = [e for e in edges if e.source == start_node_id]
         
-        for edge in outgoing_edges:
+        for edge in outgoing.get(start_node_id, []):
             # CRITICAL FIX: Continue traversal through ALL node types including conditionals
-            # Use a fresh copy of visited set for each branch to allow proper tree traversal
+            # The visited set is shared across branches: a node reached twice has the
+            # same reachable result nodes, so re-walking it only costs time
             downstream_results = self._find_all_reachable_result_nodes(
-                edge.target, edges, node_map, visited.copy()
+                edge.target, outgoing, node_map, visited
             )
             result_nodes.extend(downstream_results)
         